@@ -0,0 +1,105 @@
+"""Compare checkpoint size and (de)serialization time: default vs compact serde.
+
+Builds a synthetic `ResearchGraphState` shaped like a real run (a pool of 60
+candidate snippets, the 20-snippet page being graded, its grades) and
+serializes every channel the way the checkpointer does, once per node of the
+graph. ``compact+zstd`` is `CompactSerializer(compress_level=1)`, which
+trades dump time for bytes.
+
+    uv run python benchmarks/checkpoint_serde.py
+"""
+from __future__ import annotations
+
+import random
+import string
+import time
+
+from langchain_core.documents import Document
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from agent.nodes import CANDIDATE_POOL_SIZE, GRADE_PAGE_SIZE, SNIPPET_CHARS
+from agent.serde import CompactSerializer
+from agent.state import FilterResult
+
+NODES_PER_RUN = 9
+ROUNDS = 50
+STATES = ["California", "Texas", "New York", "Federal"]
+
+
+# Bill text is highly repetitive; a small vocabulary approximates that better
+# than uniformly random letters (which would understate compression).
+VOCAB = ["".join(random.Random(i).choices(string.ascii_lowercase, k=3 + i % 7)) for i in range(400)]
+
+
+def _text(n: int) -> str:
+    return " ".join(random.choices(VOCAB, k=n // 5))[:n]
+
+
+def synthetic_state() -> dict:
+    random.seed(0)
+    candidates = []
+    for i in range(CANDIDATE_POOL_SIZE):
+        metadata = {
+            "bill_id": f"bill-{i}",
+            "bill_identifier": f"H.B. {100 + i}",
+            "title": f"An Act relating to {_text(60)}",
+            "state": random.choice(STATES),
+            "year": 2025,
+            "session_identifier": "2025-2026 Regular Session",
+            "status": ["introduced", "referred to committee"],
+            "chunk_idx": random.randint(0, 30),
+        }
+        candidates.append((Document(page_content=_text(SNIPPET_CHARS), metadata=metadata), random.random()))
+    retrieved = candidates[:GRADE_PAGE_SIZE]
+    graded = [
+        {"doc": doc, "score": score, "is_relevant": True, "reasoning": _text(120), "doc_index": i, "title": doc.metadata["title"]}
+        for i, (doc, score) in enumerate(retrieved[:8])
+    ]
+    return {
+        "enhanced_query": _text(200),
+        "filters": FilterResult(state="California", year=[2025]),
+        "candidates": candidates,
+        "retrieved_docs": retrieved,
+        "graded_docs": graded,
+    }
+
+
+def bench(serde, state: dict) -> tuple[int, float, float]:
+    total_bytes = 0
+    dump_s = load_s = 0.0
+    for _ in range(ROUNDS):
+        for value in state.values():
+            t0 = time.perf_counter()
+            typed = serde.dumps_typed(value)
+            t1 = time.perf_counter()
+            serde.loads_typed(typed)
+            t2 = time.perf_counter()
+            total_bytes += len(typed[1])
+            dump_s += t1 - t0
+            load_s += t2 - t1
+    per_run = NODES_PER_RUN / ROUNDS
+    return int(total_bytes * per_run), dump_s * per_run * 1e3, load_s * per_run * 1e3
+
+
+def main() -> None:
+    state = synthetic_state()
+    serdes = [
+        ("jsonplus", JsonPlusSerializer()),
+        ("compact", CompactSerializer()),
+        ("compact+zstd", CompactSerializer(compress_level=1)),
+    ]
+    results = {name: bench(serde, state) for name, serde in serdes}
+    print(f"{'serde':<16}{'bytes/run':>14}{'dump ms/run':>14}{'load ms/run':>14}")
+    for name, (size, dump_ms, load_ms) in results.items():
+        print(f"{name:<16}{size:>14,}{dump_ms:>14.2f}{load_ms:>14.2f}")
+    base = results["jsonplus"]
+    for name in ("compact", "compact+zstd"):
+        size, dump_ms, load_ms = results[name]
+        print(
+            f"{name}: {1 - size / base[0]:.1%} fewer bytes, "
+            f"dump {base[1] / dump_ms:.2f}x, load {base[2] / load_ms:.2f}x the speed of jsonplus"
+        )
+
+
+if __name__ == "__main__":
+    main()
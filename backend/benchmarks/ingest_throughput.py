@@ -0,0 +1,164 @@
+"""Measure incremental ingestion throughput: full load vs. amended re-ingest.
+
+Runs `ingest_bills` against a local SQLite database with the same
+``(bill_id, chunk_idx)`` upsert semantics as ``chunks_test2`` and a fake
+embedder that simulates per-request latency, so no Supabase or OpenAI
+credentials are needed. Later passes amend 10% of the bills by inserting one
+paragraph mid-text, then near the start, and should re-embed only the
+chunks around each edit: chunks shifted to a new ``chunk_idx`` reuse their
+stored embedding.
+
+    uv run python benchmarks/ingest_throughput.py [--bills 500]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import string
+import time
+from typing import Any, Dict, List, Tuple
+
+from agent.ingest import CHUNKS_TABLE, BillRecord, ingest_bills
+
+EMBED_DIM = 1536
+# Roughly one OpenAI embeddings round trip plus a per-input cost.
+REQUEST_LATENCY_S = 0.15
+PER_INPUT_LATENCY_S = 0.0002
+
+VOCAB = ["".join(random.Random(i).choices(string.ascii_lowercase, k=3 + i % 7)) for i in range(400)]
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choices(VOCAB, k=rng.randint(20, 120))) + ".\n\n"
+
+
+def synthetic_bills(n: int) -> List[BillRecord]:
+    rng = random.Random(0)
+    return [
+        {
+            "id": f"bill-{i}",
+            "bill_identifier": f"H.B. {100 + i}",
+            "title": f"An Act relating to {' '.join(rng.choices(VOCAB, k=8))}",
+            "state": rng.choice(["California", "Texas", "New York", "Federal"]),
+            "year": 2025,
+            "full_text": "".join(_paragraph(rng) for _ in range(rng.randint(20, 120))),
+        }
+        for i in range(n)
+    ]
+
+
+def amend(bills: List[BillRecord], fraction: float, where: float) -> List[BillRecord]:
+    """Insert a paragraph at relative position *where* in a *fraction* of the bills."""
+    rng = random.Random(1)
+    amended = []
+    for bill in bills:
+        bill = dict(bill)
+        if rng.random() < fraction:
+            paragraphs = bill["full_text"].split("\n\n")
+            paragraphs.insert(int(len(paragraphs) * where), "Sec. 2a. " + " ".join(rng.choices(VOCAB, k=60)) + ".")
+            bill["full_text"] = "\n\n".join(paragraphs)
+        amended.append(bill)
+    return amended
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(REQUEST_LATENCY_S + PER_INPUT_LATENCY_S * len(texts))
+        vectors = []
+        for text in texts:
+            vector = [0.0] * EMBED_DIM
+            vector[hash(text) % EMBED_DIM] = 1.0
+            vectors.append(vector)
+        return vectors
+
+
+class SQLiteChunkStore:
+    def __init__(self) -> None:
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("CREATE TABLE bills (id TEXT PRIMARY KEY, data TEXT)")
+        self.tables: set = set()
+
+    def _table(self, table: str) -> str:
+        if table not in self.tables:
+            self.db.execute(
+                f"""
+                CREATE TABLE {table} (
+                    bill_id TEXT, chunk_idx INTEGER, chunk_text TEXT, content_hash TEXT,
+                    embedding TEXT, metadata TEXT, PRIMARY KEY (bill_id, chunk_idx)
+                )
+                """
+            )
+            self.tables.add(table)
+        return table
+
+    def existing_hashes(self, table: str, bill_ids: List[str]) -> Dict[str, Dict[int, str]]:
+        hashes: Dict[str, Dict[int, str]] = {bill_id: {} for bill_id in bill_ids}
+        marks = ",".join("?" * len(bill_ids))
+        for bill_id, idx, digest in self.db.execute(
+            f"SELECT bill_id, chunk_idx, content_hash FROM {self._table(table)} WHERE bill_id IN ({marks})", bill_ids
+        ):
+            hashes[bill_id][idx] = digest
+        return hashes
+
+    def embeddings_by_hash(self, table: str, bill_ids: List[str], hashes: List[str]) -> Dict[Tuple[str, str], Any]:
+        bill_marks, hash_marks = ",".join("?" * len(bill_ids)), ",".join("?" * len(hashes))
+        rows = self.db.execute(
+            f"SELECT bill_id, content_hash, embedding FROM {self._table(table)} "
+            f"WHERE bill_id IN ({bill_marks}) AND content_hash IN ({hash_marks})",
+            bill_ids + hashes,
+        )
+        return {(bill_id, digest): json.loads(embedding) for bill_id, digest, embedding in rows}
+
+    def upsert_bills(self, rows: List[Dict[str, Any]]) -> None:
+        self.db.executemany(
+            "INSERT INTO bills VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            [(row["id"], json.dumps(row)) for row in rows],
+        )
+
+    def upsert_chunks(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        self.db.executemany(
+            f"""
+            INSERT INTO {self._table(table)} VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(bill_id, chunk_idx) DO UPDATE SET chunk_text = excluded.chunk_text,
+                content_hash = excluded.content_hash, embedding = excluded.embedding, metadata = excluded.metadata
+            """,
+            [
+                (r["bill_id"], r["chunk_idx"], r["chunk_text"], r["content_hash"], json.dumps(r["embedding"]), json.dumps(r["metadata"]))
+                for r in rows
+            ],
+        )
+
+    def delete_chunks_from(self, table: str, bill_id: str, start_idx: int) -> None:
+        self.db.execute(f"DELETE FROM {self._table(table)} WHERE bill_id = ? AND chunk_idx >= ?", (bill_id, start_idx))
+
+    def full_text(self, bill_id: str) -> str:
+        rows = self.db.execute(f"SELECT chunk_text FROM {CHUNKS_TABLE} WHERE bill_id = ? ORDER BY chunk_idx", (bill_id,))
+        return "".join(text for (text,) in rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bills", type=int, default=500)
+    parser.add_argument("--amend", type=float, default=0.1, help="fraction of bills amended before the second pass")
+    args = parser.parse_args()
+
+    store = SQLiteChunkStore()
+    bills = synthetic_bills(args.bills)
+    mid = amend(bills, args.amend, where=0.5)
+    early = amend(mid, args.amend, where=0.05)
+    passes = (("initial", bills), ("mid-edit", mid), ("early-edit", early), ("unchanged", early))
+    print(f"{'pass':<12}{'chunks':>8}{'embedded':>10}{'moved':>8}{'deleted':>9}{'requests':>10}{'seconds':>9}{'chunks/s':>10}")
+    for name, batch in passes:
+        stats = ingest_bills(batch, store=store, embedder=FakeEmbeddings())
+        rate = stats.chunks / stats.seconds if stats.seconds else float("inf")
+        print(
+            f"{name:<12}{stats.chunks:>8}{stats.chunks_embedded:>10}{stats.chunks_moved:>8}{stats.chunks_deleted:>9}"
+            f"{stats.embed_requests:>10}{stats.seconds:>9.2f}{rate:>10.0f}"
+        )
+    assert all(store.full_text(bill["id"]) == bill["full_text"] for bill in early)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,115 @@
-from agent.graph import graph
-from agent.state import ResearchGraphState, FilterResult, ReconstructedBill, BillSummary
-from agent.tools_and_schemas import DocumentGrades
-from agent.nodes import (
-    preprocess_input,
-    compile_final_research,
-    extract_filters,
-    grade_documents,
-    reconstruct_full_text,
-    retrieve_documents,
-    summarize_bills,
-)
-from agent.configuration import get_llm, get_supabase_client
-from agent.retrieval import retriever
-from agent.prompts import (
-    enhance_query_instructions,
-    extract_filters_instructions,
-    grade_documents_instructions,
-    summarize_bills_instructions,
-    compile_final_report_instructions,
-)
+"""Sporos research agent.
+
+Public names are resolved lazily (PEP 562) so that ``import agent`` stays
+cheap: the graph, LLM/Supabase clients and provider SDKs are only imported
+when first used. Call `start_warmup` to build them ahead of the first
+request.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from agent.graph import graph
+    from agent.state import ResearchGraphState, FilterResult, ReconstructedBill, BillSummary
+    from agent.tools_and_schemas import DocumentGrades
+    from agent.nodes import (
+        preprocess_input,
+        compile_final_research,
+        extract_filters,
+        check_answer_cache,
+        lookup_bill,
+        next_page,
+        grade_documents,
+        grade_and_summarize,
+        reconstruct_full_text,
+        retrieve_documents,
+        summarize_bills,
+        store_answer,
+    )
+    from agent.configuration import get_llm, get_supabase_client
+    from agent.retrieval import retriever, search_bills
+    from agent.serde import CompactSerializer
+    from agent.answer_cache import SemanticAnswerCache, get_answer_cache
+    from agent.prompts import (
+        enhance_query_instructions,
+        extract_filters_instructions,
+        grade_documents_instructions,
+        summarize_bills_instructions,
+        compile_final_report_instructions,
+    )
+    from agent.warmup import start_warmup, warmup
+    from agent.ingest import ingest_bills
+    from agent.citations import cite
+
+# public name -> defining module
+_LAZY_ATTRS = {
+    "graph": "agent.graph",
+    "ResearchGraphState": "agent.state",
+    "FilterResult": "agent.state",
+    "ReconstructedBill": "agent.state",
+    "BillSummary": "agent.state",
+    "DocumentGrades": "agent.tools_and_schemas",
+    "preprocess_input": "agent.nodes",
+    "compile_final_research": "agent.nodes",
+    "extract_filters": "agent.nodes",
+    "check_answer_cache": "agent.nodes",
+    "lookup_bill": "agent.nodes",
+    "next_page": "agent.nodes",
+    "grade_documents": "agent.nodes",
+    "grade_and_summarize": "agent.nodes",
+    "reconstruct_full_text": "agent.nodes",
+    "retrieve_documents": "agent.nodes",
+    "summarize_bills": "agent.nodes",
+    "store_answer": "agent.nodes",
+    "get_llm": "agent.configuration",
+    "get_supabase_client": "agent.configuration",
+    "retriever": "agent.retrieval",
+    "search_bills": "agent.retrieval",
+    "CompactSerializer": "agent.serde",
+    "SemanticAnswerCache": "agent.answer_cache",
+    "get_answer_cache": "agent.answer_cache",
+    "enhance_query_instructions": "agent.prompts",
+    "extract_filters_instructions": "agent.prompts",
+    "grade_documents_instructions": "agent.prompts",
+    "summarize_bills_instructions": "agent.prompts",
+    "compile_final_report_instructions": "agent.prompts",
+    "warmup": "agent.warmup",
+    "start_warmup": "agent.warmup",
+    "ingest_bills": "agent.ingest",
+    "cite": "agent.citations",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+# Public names that share a name with their defining submodule.
+_SHADOWED = frozenset(name for name, module in _LAZY_ATTRS.items() if module == f"{__name__}.{name}")
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing a submodule binds it on the package (``agent.graph`` =
+        # the module), which would hide the public object of the same name
+        # from `__getattr__`. Keep the public object, as an eager
+        # ``from agent.graph import graph`` would.
+        if name in _SHADOWED and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
 
 __all__ = [
     # Graph
@@ -33,15 +124,33 @@ __all__ = [
     "preprocess_input",
     "compile_final_research",
     "extract_filters",
+    "check_answer_cache",
+    "lookup_bill",
+    "next_page",
     "grade_documents",
+    "grade_and_summarize",
     "reconstruct_full_text",
     "retrieve_documents",
     "summarize_bills",
+    "store_answer",
     # Configuration
     "get_llm",
     "get_supabase_client",
     # Retrieval
     "retriever",
+    "search_bills",
+    # Checkpointing
+    "CompactSerializer",
+    # Answer cache
+    "SemanticAnswerCache",
+    "get_answer_cache",
+    # Warmup
+    "warmup",
+    "start_warmup",
+    # Ingestion
+    "ingest_bills",
+    # Citations
+    "cite",
     # Prompts
     "enhance_query_instructions",
     "extract_filters_instructions",
@@ -0,0 +1,213 @@
+"""Semantic cache of whole research answers.
+
+Users often ask the same question in different words ("AI bills in
+California this year"). Once `preprocess_input` and `extract_filters` have
+run, a prior run is reusable when its filters match exactly and its enhanced
+query is close in embedding space; the stored report and bill cards are then
+replayed instead of running retrieval, grading and summarization again,
+along with the run's candidate pool and cursor so "more bills" follow-ups
+page on from where the original answer stopped.
+
+Entries expire after a TTL and the least recently used ones are evicted
+beyond an entry cap or a byte budget (every bill card carries its bill's
+full text, so entries vary widely in size). Each entry records the text hash
+of every bill it cites; a hit is only replayed if `stale_bills` finds those
+hashes unchanged in ``bills_dup2``, where `agent.ingest` writes them. That check works across
+processes, so a separate ingestion run invalidates the server's answers.
+`invalidate_bills` additionally drops entries eagerly within one process.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from agent.state import FilterResult
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def filters_key(filters: Optional[FilterResult]) -> str:
+    """Return the exact-match key for *filters* (``"null"`` when absent)."""
+    return filters.model_dump_json() if filters else "null"
+
+
+@dataclass(slots=True)
+class CachedAnswer:
+    report: str
+    bill_card_data: List[Dict[str, Any]]
+    bill_ids: Set[str]
+    bill_versions: Dict[str, str]  # bill_id -> hash of the full text the answer used
+    filters_key: str
+    embedding: np.ndarray = field(repr=False)
+    citations: List[Dict[str, Any]] = field(default_factory=list)
+    # Ranked (snippet, score) pool and paging cursor of the answered run.
+    candidates: Optional[List[Tuple[Any, float]]] = None
+    cursor: Optional[Dict[str, Any]] = None
+    size: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+def _approx_size(value: Any) -> int:
+    """Rough in-memory footprint of a report/card payload, dominated by its text."""
+    if isinstance(value, str):
+        return len(value)
+    if hasattr(value, "page_content"):  # a candidate Document snippet
+        return len(value.page_content) + _approx_size(value.metadata)
+    if isinstance(value, dict):
+        return sum(_approx_size(v) for v in value.values()) + 64
+    if isinstance(value, (list, tuple, set)):
+        return sum(_approx_size(v) for v in value) + 16
+    return 16
+
+
+class SemanticAnswerCache:
+    """In-process store of final answers keyed by (filters, query embedding)."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._by_bill: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, embedding: Sequence[float], filters: str, threshold: float) -> Optional[CachedAnswer]:
+        """Return the closest live entry for *filters* with cosine similarity >= *threshold*."""
+        import numpy as np
+
+        query = _normalize(embedding)
+        with self._lock:
+            self._expire()
+            candidates = [(key, entry) for key, entry in self._entries.items() if entry.filters_key == filters]
+            if not candidates:
+                return None
+            sims = np.stack([entry.embedding for _, entry in candidates]) @ query
+            best = int(np.argmax(sims))
+            if sims[best] < threshold:
+                return None
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            return entry
+
+    def store(
+        self,
+        embedding: Sequence[float],
+        filters: str,
+        report: str,
+        bill_card_data: List[Dict[str, Any]],
+        bill_versions: Mapping[str, str],
+        citations: Optional[List[Dict[str, Any]]] = None,
+        candidates: Optional[List[Tuple[Any, float]]] = None,
+        cursor: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        entry = CachedAnswer(
+            report=report,
+            bill_card_data=bill_card_data,
+            bill_ids=set(bill_versions),
+            bill_versions=dict(bill_versions),
+            filters_key=filters,
+            embedding=_normalize(embedding),
+            citations=citations or [],
+            candidates=candidates,
+            cursor=cursor,
+        )
+        entry.size = _approx_size([report, bill_card_data, entry.citations, candidates, cursor]) + entry.embedding.nbytes
+        if entry.size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._entries[key] = entry
+            self.bytes += entry.size
+            for bill_id in entry.bill_ids:
+                self._by_bill.setdefault(bill_id, set()).add(key)
+            self._expire()
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_bills(self, bill_ids: Iterable[str]) -> int:
+        """Drop every entry citing any of *bill_ids*; return how many were dropped."""
+        with self._lock:
+            keys = set().union(*(self._by_bill.get(bill_id, set()) for bill_id in bill_ids))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_bill.clear()
+            self.bytes = 0
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        # Entries are only ever appended or moved to the end on a hit, so the
+        # oldest-created ones aren't necessarily first; scan them all.
+        for key in [key for key, entry in self._entries.items() if entry.created_at < cutoff]:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.size
+        for bill_id in entry.bill_ids:
+            keys = self._by_bill.get(bill_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_bill[bill_id]
+
+
+def stale_bills(sb, bill_versions: Mapping[str, str]) -> List[str]:
+    """Return the bill_ids whose text changed since an answer was cached.
+
+    Compares against ``bills_dup2.content_hash``. Bills without one (never
+    re-ingested by `agent.ingest`) count as unchanged; deleted bills as stale.
+    """
+    if not bill_versions:
+        return []
+    res = sb.table("bills_dup2").select("id, content_hash").in_("id", list(bill_versions)).execute()
+    current = {row["id"]: row.get("content_hash") for row in res.data}
+    return [
+        bill_id
+        for bill_id, version in bill_versions.items()
+        if bill_id not in current or (current[bill_id] is not None and current[bill_id] != version)
+    ]
+
+
+def _normalize(embedding: Sequence[float]) -> np.ndarray:
+    import numpy as np
+
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> SemanticAnswerCache:
+    """Return the process-wide answer cache (TTL/size from the environment)."""
+    return SemanticAnswerCache(
+        ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        max_bytes=int(os.getenv("ANSWER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    )
@@ -1,10 +1,239 @@
 # mypy: disable - error - code = "no-untyped-def,misc"
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
 import pathlib
+import re
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
 from fastapi import FastAPI, Response
-from fastapi.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from agent.warmup import start_warmup
+
+try:  # optional: brotli variants are only served when the encoder is installed
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build LLM/vector-store clients in the background so the first graph
+    # request doesn't pay for the lazy imports. Set AGENT_WARMUP=false to skip.
+    if os.getenv("AGENT_WARMUP", "true").lower() != "false":
+        start_warmup()
+    # Index (and, for files the build didn't precompress, compress) the
+    # frontend once per worker at startup rather than at import.
+    if isinstance(frontend, PrecompressedStaticFiles):
+        await asyncio.to_thread(frontend.load)
+    yield
+
 
 # Define the FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Vite emits content-hashed bundles as assets/<name>-<hash>.<ext>; their URL
+# changes whenever their content does, so they can be cached forever.
+HASHED_ASSET_RE = re.compile(r"(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Below this size compression doesn't pay for the extra header/framing bytes.
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/wasm")
+
+
+@dataclass(slots=True)
+class _Variant:
+    body: bytes
+    etag: str
+
+
+@dataclass(slots=True)
+class _Asset:
+    media_type: str
+    cache_control: str
+    variants: Dict[str, _Variant] = field(default_factory=dict)  # encoding -> variant
+
+
+def _etag(body: bytes, encoding: str) -> str:
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return f'"{digest}-{encoding}"'
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into ``{encoding: q}``."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _negotiate(header: str, available: Dict[str, _Variant]) -> str:
+    """Pick the available encoding with the highest q-value in *header*.
+
+    Unlisted encodings take the ``*`` weight; ``identity`` is acceptable
+    unless excluded explicitly (or by ``*;q=0``). Ties prefer br, then gzip,
+    then identity, the smallest first. When nothing acceptable is available
+    the identity bytes are served rather than a 406.
+    """
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get("*")
+
+    def weight(encoding: str) -> float:
+        if encoding in accepted:
+            return accepted[encoding]
+        if wildcard is not None:
+            return wildcard
+        return 1.0 if encoding == "identity" else 0.0
+
+    q, encoding = max(
+        ((weight(enc), enc) for enc in ("br", "gzip", "identity") if enc in available),
+        key=lambda candidate: candidate[0],
+    )
+    return encoding if q > 0 else "identity"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of *etag* against an If-None-Match header (RFC 7232 §3.2)."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class PrecompressedStaticFiles:
+    """Serve a built frontend from an in-memory index with br/gzip negotiation.
+
+    The build directory is indexed once, by `load` from the app's lifespan
+    (or on the first request if that hasn't run). Each file keeps its
+    identity bytes plus brotli/gzip variants, taken from the ``<file>.br`` /
+    ``<file>.gz`` the frontend build writes (see ``vite.config.ts``) or
+    compressed here otherwise.
+    Responses carry strong ETags (304 when ``If-None-Match`` matches under weak
+    comparison, so ``W/`` tags from proxies still validate); hashed assets are
+    marked immutable and everything else (``index.html``) must revalidate.
+    Mirrors ``StaticFiles(html=True)``: directories serve their ``index.html``
+    and unknown paths serve ``404.html`` if the build has one.
+    """
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+        self._assets: Optional[Dict[str, _Asset]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def assets(self) -> Dict[str, _Asset]:
+        """Relative path -> asset, indexing the build directory on first use."""
+        if self._assets is None:
+            self.load()
+        return self._assets
+
+    def load(self) -> None:
+        """Build the in-memory index of the build directory (once)."""
+        with self._lock:
+            if self._assets is not None:
+                return
+            assets = {}
+            for path in sorted(self.directory.rglob("*")):
+                if not path.is_file() or path.suffix in (".br", ".gz"):
+                    continue
+                assets[path.relative_to(self.directory).as_posix()] = self._load(path)
+            self._assets = assets
+
+    def _load(self, path: pathlib.Path) -> _Asset:
+        rel = path.relative_to(self.directory).as_posix()
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        asset = _Asset(
+            media_type=media_type,
+            cache_control=IMMUTABLE_CACHE if HASHED_ASSET_RE.search(rel) else REVALIDATE_CACHE,
+        )
+        body = path.read_bytes()
+        asset.variants["identity"] = _Variant(body, _etag(body, "identity"))
+        if len(body) < MIN_COMPRESS_SIZE or not media_type.startswith(COMPRESSIBLE_TYPES):
+            return asset
+
+        for encoding, suffix, compress in (
+            ("br", ".br", brotli.compress if brotli else None),
+            ("gzip", ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+        ):
+            prebuilt = path.with_name(path.name + suffix)
+            if prebuilt.is_file():
+                compressed = prebuilt.read_bytes()
+            elif compress is not None:
+                compressed = compress(body)
+            else:
+                continue
+            if len(compressed) < len(body):
+                asset.variants[encoding] = _Variant(compressed, _etag(compressed, encoding))
+        return asset
+
+    def _resolve(self, path: str) -> Optional[str]:
+        rel = path.lstrip("/")
+        if rel in self.assets:
+            return rel
+        index = f"{rel.rstrip('/')}/index.html".lstrip("/")
+        if index in self.assets:
+            return index
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await Response("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        # Under a Mount, newer Starlette keeps the full path and puts the mount
+        # prefix in root_path.
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        status = 200
+        key = self._resolve(path)
+        if key is None:
+            key = "404.html" if "404.html" in self.assets else None
+            status = 404
+        if key is None:
+            await Response("Not Found", status_code=404, media_type="text/plain")(scope, receive, send)
+            return
+
+        asset = self.assets[key]
+        encoding = _negotiate(headers.get("accept-encoding", ""), asset.variants)
+        variant = asset.variants[encoding]
+        response_headers = {
+            "Cache-Control": asset.cache_control,
+            "ETag": variant.etag,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+
+        if status == 200 and _etag_matches(headers.get("if-none-match", ""), variant.etag):
+            await Response(status_code=304, headers=response_headers)(scope, receive, send)
+            return
+
+        body = b"" if method == "HEAD" else variant.body
+        response = Response(body, status_code=status, media_type=asset.media_type, headers=response_headers)
+        if method == "HEAD":
+            response.headers["Content-Length"] = str(len(variant.body))
+        await response(scope, receive, send)
 
 
 def create_frontend_router(build_dir="../frontend/dist"):
@@ -34,12 +263,13 @@ def create_frontend_router(build_dir="../frontend/dist"):
 
         return Route("/{path:path}", endpoint=dummy_frontend)
 
-    return StaticFiles(directory=build_path, html=True)
+    return PrecompressedStaticFiles(build_path)
 
 
 # Mount the frontend under /app to not conflict with the LangGraph API routes
+frontend = create_frontend_router()
 app.mount(
     "/app",
-    create_frontend_router(),
+    frontend,
     name="frontend",
 )
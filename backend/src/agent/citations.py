@@ -0,0 +1,174 @@
+"""Ground report sentences in the bill chunks retrieval already scored.
+
+`search_bills` hands every chunk it fetched, with the embedding the vector
+store returned, to `remember_chunks` (the search function must select the
+``embedding`` column and return ``bill_id``/``chunk_idx`` in each chunk's
+metadata; see `agent.retrieval`). Once the report is written, `cite`
+embeds its sentences in one batch, scores them against the remembered
+chunks of the summarized bills with a single matrix product, and appends
+a marker linking each supported sentence to its best bills. It makes no LLM
+calls and no vector-store queries.
+
+Chunk embeddings live in a bounded in-process LRU. A run that never retrieved
+(e.g. a direct bill lookup) or was resumed in another process simply gets
+no citations.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from langchain_core.documents import Document
+
+from agent.utils import insert_citation_markers
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_REMEMBERED_CHUNKS = 8192
+MAX_CITATIONS_PER_SENTENCE = 2
+# Headings, list labels and other fragments this short aren't worth citing.
+MIN_SENTENCE_WORDS = 5
+
+# Candidate sentence ends: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace and the next token's first character.
+_END_RE = re.compile(r"[.!?]+[\"')\]]*(?=[ \t]+(\S))")
+# Tokens whose trailing period doesn't end a sentence: initialisms such as
+# "S.B." / "U.S." and common legislative/title abbreviations ("Sec. 2").
+_ABBREVIATION_RE = re.compile(
+    r"^[(\"']*(?:(?:[A-Za-z]\.)+|(?:Sec|Secs|Art|Ch|Cl|No|Nos|Para|Pub|Stat|Mr|Mrs|Ms|Dr|St|Jr|Inc|Co|Corp|v|vs|e\.g|i\.e)\.)$"
+)
+
+ChunkKey = Tuple[str, int]
+
+_chunks: "OrderedDict[ChunkKey, np.ndarray]" = OrderedDict()
+_chunks_lock = threading.Lock()
+
+
+def remember_chunks(hits: Iterable[Tuple[Document, float, Any]]) -> None:
+    """Keep the embedding of each ``(doc, score, embedding)`` hit for citation."""
+    import numpy as np
+
+    with _chunks_lock:
+        for doc, _, embedding in hits:
+            bill_id, chunk_idx = doc.metadata.get("bill_id"), doc.metadata.get("chunk_idx")
+            if bill_id is None or chunk_idx is None or embedding is None or len(embedding) == 0:
+                continue
+            key = (bill_id, int(chunk_idx))
+            if key in _chunks:
+                _chunks.move_to_end(key)
+                continue
+            vec = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            _chunks[key] = vec / norm if norm else vec
+        while len(_chunks) > MAX_REMEMBERED_CHUNKS:
+            _chunks.popitem(last=False)
+
+
+def _chunks_for(bill_ids: Iterable[str]) -> Tuple[List[ChunkKey], Optional[np.ndarray]]:
+    import numpy as np
+
+    wanted = set(bill_ids)
+    with _chunks_lock:
+        keys = [key for key in _chunks if key[0] in wanted]
+        if not keys:
+            return [], None
+        return keys, np.stack([_chunks[key] for key in keys])
+
+
+def _sentence_ends(line: str) -> Iterator[int]:
+    for match in _END_RE.finditer(line):
+        if not (match.group(1).isupper() or match.group(1) in "\"'([*_"):
+            continue  # "S.B. 1047", "e.g. a bill": the next word doesn't start a sentence
+        token = line[: match.start()].rsplit(None, 1)[-1] + match.group()
+        if match.group().startswith(".") and _ABBREVIATION_RE.match(token.rstrip("\"')]")):
+            continue
+        yield match.end()
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` offsets of the citable sentences in *text*.
+
+    Line breaks always end a sentence; within a line, a sentence ends at
+    terminal punctuation followed by a capitalized word, unless the period
+    belongs to an abbreviation like "S.B." or "Sec.".
+    """
+    spans = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start = 0
+        for end in [*_sentence_ends(line), len(line.rstrip())]:
+            sentence = line[start:end]
+            stripped = sentence.lstrip()
+            if len(stripped.split()) >= MIN_SENTENCE_WORDS:
+                spans.append((offset + start + len(sentence) - len(stripped), offset + end))
+            start = end
+        offset += len(line)
+    return spans
+
+
+def cite(
+    report: str,
+    bills: Sequence[Dict[str, Any]],
+    embed_documents,
+    threshold: float,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """Return *report* with citation markers, plus the citations inserted.
+
+    Args:
+        report: The compiled final report.
+        bills: `ReconstructedBill`s the report was written from.
+        embed_documents: Batch embedding function (same model as the index).
+        threshold: Minimum cosine similarity for a chunk to support a sentence.
+
+    Each citation is ``{"start_index", "end_index", "segments"}`` as consumed
+    by `insert_citation_markers`, with one segment per cited bill carrying its
+    ``bill_id``, best ``chunk_idx`` and ``score``.
+    """
+    import numpy as np
+
+    by_id = {bill["id"]: bill for bill in bills}
+    keys, matrix = _chunks_for(by_id)
+    spans = split_sentences(report)
+    if matrix is None or not spans:
+        return report, []
+
+    sentences = np.asarray(embed_documents([report[start:end] for start, end in spans]), dtype=np.float32)
+    sentences /= np.linalg.norm(sentences, axis=1, keepdims=True).clip(min=1e-12)
+    sims = sentences @ matrix.T  # (sentences, chunks)
+
+    citations = []
+    for (start, end), row in zip(spans, sims):
+        segments: List[Dict[str, Any]] = []
+        for col in np.argsort(row)[::-1]:
+            if row[col] < threshold or len(segments) >= MAX_CITATIONS_PER_SENTENCE:
+                break
+            bill_id, chunk_idx = keys[col]
+            if any(segment["bill_id"] == bill_id for segment in segments):
+                continue
+            bill = by_id[bill_id]
+            label = next((v for v in (bill.get("bill_identifier"), bill.get("title")) if v and v != "N/A"), bill_id)
+            segments.append(
+                {
+                    "label": label,
+                    "short_url": bill.get("full_text_url"),
+                    "bill_id": bill_id,
+                    "chunk_idx": chunk_idx,
+                    "score": round(float(row[col]), 4),
+                }
+            )
+        if segments:
+            citations.append({"start_index": start, "end_index": end, "segments": segments})
+    return insert_citation_markers(report, citations), citations
@@ -2,51 +2,70 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from dotenv import load_dotenv
-from supabase import Client, create_client  # type: ignore
-
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import SupabaseVectorStore
-from langchain.chat_models import init_chat_model
 from pydantic import BaseModel, Field
 from langchain_core.runnables import RunnableConfig
 
+# The provider SDKs below are slow to import (~1s together), so they are only
+# imported when a client is first built; see `agent.warmup` to pay that cost
+# up front in the background.
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import SupabaseVectorStore
+    from langchain_openai import OpenAIEmbeddings
+    from supabase import Client
+
 load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY not found in environment variables")
-if not SUPABASE_URL:
-    raise ValueError("SUPABASE_URL not found in environment variables")
-if not SUPABASE_SERVICE_ROLE_KEY:
-    raise ValueError("SUPABASE_SERVICE_ROLE_KEY not found in environment variables")
+def _require_env(name: str) -> str:
+    """Return env var *name*, raising if it's missing (checked at first use, not import)."""
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} not found in environment variables")
+    return value
+
 
 @lru_cache(maxsize=1)
 def get_supabase_client() -> Client:  # pragma: no cover
     """Return a cached Supabase client instance."""
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)  # type: ignore[arg-type]
+    from supabase import create_client  # type: ignore
+
+    return create_client(_require_env("SUPABASE_URL"), _require_env("SUPABASE_SERVICE_ROLE_KEY"))
 
 
 @lru_cache(maxsize=1)
-def get_vector_store(table_name: str = "chunks_test2") -> SupabaseVectorStore:  # pragma: no cover
-    """Return a cached `SupabaseVectorStore` bound to *table_name*."""
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+def get_embeddings() -> OpenAIEmbeddings:  # pragma: no cover
+    """Return the cached embeddings client shared by every vector store."""
+    from langchain_openai import OpenAIEmbeddings
+
+    _require_env("OPENAI_API_KEY")
+    # One embed_documents call per ingest batch (the API takes up to 2048 inputs).
+    return OpenAIEmbeddings(model="text-embedding-3-small", chunk_size=2048)
+
+
+@lru_cache(maxsize=16)
+def get_vector_store(
+    table_name: str = "chunks_test2", query_name: str = "search_bill_chunks_langchain"
+) -> SupabaseVectorStore:  # pragma: no cover
+    """Return a cached `SupabaseVectorStore` bound to *table_name* (one per shard)."""
+    from langchain_community.vectorstores import SupabaseVectorStore
+
     return SupabaseVectorStore(
         client=get_supabase_client(),
-        embedding=embeddings,
+        embedding=get_embeddings(),
         table_name=table_name,
-        query_name="search_bill_chunks_langchain",
+        query_name=query_name,
     )
 
 
 @lru_cache(maxsize=4)
 def get_llm(model: str = "gpt-4o-mini"):
     """Return (and cache) an LLM created via `init_chat_model`. Keyed by model name."""
+    from langchain.chat_models import init_chat_model
+
+    _require_env("OPENAI_API_KEY")
     return init_chat_model(model=model)
 
 
@@ -67,6 +86,34 @@ class Configuration(BaseModel):
         },
     )
 
+    pipelined_grading: bool = Field(
+        default=True,
+        metadata={
+            "description": "Reconstruct and summarize each relevant bill while grading is still streaming, instead of waiting for the full set of grades."
+        },
+    )
+
+    answer_cache_threshold: float = Field(
+        default=0.95,
+        metadata={
+            "description": "Minimum cosine similarity between enhanced queries (with identical filters) to replay a cached answer. Set above 1 to disable the cache."
+        },
+    )
+
+    next_page: bool = Field(
+        default=False,
+        metadata={
+            "description": "Continue the thread's previous search with its next page of candidate bills instead of starting a new search."
+        },
+    )
+
+    citation_threshold: float = Field(
+        default=0.45,
+        metadata={
+            "description": "Minimum cosine similarity between a report sentence and a retrieved bill chunk to cite that bill. Set above 1 to disable citations."
+        },
+    )
+
 
     @classmethod
     def from_runnable_config(
@@ -6,21 +6,32 @@ functions from :pymod:`agent2.nodes` and data models from
 """
 from __future__ import annotations
 
-from langgraph.graph import StateGraph
+import re
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, StateGraph
 from langgraph.constants import Send
+from langchain_core.runnables import RunnableConfig
+
+from agent.configuration import Configuration
 
 from agent.state import ResearchGraphState, FilterResult, ReconstructedBill
 from agent.nodes import (
     preprocess_input,
     compile_final_research,
     extract_filters,
+    lookup_bill,
+    next_page,
     grade_documents,
+    grade_and_summarize,
     reconstruct_full_text,
     retrieve_documents,
     summarize_bills,
     emit_bill_card_data,
+    check_answer_cache,
+    store_answer,
 )
-from typing import List
+from typing import List, Union
 
 
 def initiate_parallel_summaries(state: ResearchGraphState) -> List[Send]:
@@ -72,6 +83,60 @@ def initiate_parallel_grading(state: ResearchGraphState) -> List[Send]:
         }))
     return sends
 
+# Short follow-ups like "more", "next page" or "show me more bills".
+_NEXT_PAGE_RE = re.compile(
+    r"^\W*(?:(?:show|give|find|get|load)\s+(?:me\s+)?)?(?:some\s+)?(?:more|next|another|additional|other)\b"
+    r"(?:\s+(?:page|bills?|results?|ones?|please))*\W*$",
+    re.IGNORECASE,
+)
+
+def route_entry(state: ResearchGraphState, config: RunnableConfig) -> str:
+    """Continue the previous search for "more bills" follow-ups, else start a new one.
+
+    Every answered run leaves a cursor: retrieval and cache hits with their
+    candidate pool, a direct bill lookup without one (see `next_page`).
+    """
+    if not state.get("cursor"):
+        return "preprocess_input"
+    if Configuration.from_runnable_config(config).next_page:
+        return "next_page"
+    messages = state.get("messages") or []
+    last = messages[-1] if messages else None
+    if isinstance(last, HumanMessage) and isinstance(last.content, str) and _NEXT_PAGE_RE.match(last.content):
+        return "next_page"
+    return "preprocess_input"
+
+def route_after_next_page(state: ResearchGraphState, config: RunnableConfig) -> str:
+    """Grade the new page, or stop if the candidate pool is exhausted."""
+    if not state.get("retrieved_docs"):
+        return END
+    return route_grading(state, config)
+
+def route_after_filters(state: ResearchGraphState) -> str:
+    """Take the direct-lookup fast path when the user named a specific bill."""
+    filters = state.get("filters")
+    if filters and filters.bill_identifier:
+        return "lookup_bill"
+    return "retrieve_documents"
+
+def route_after_answer_cache(state: ResearchGraphState) -> str:
+    """Stop on a cache hit (the answer was already replayed), else carry on."""
+    if state.get("answer_cache_hit"):
+        return END
+    return route_after_filters(state)
+
+def route_after_bill_lookup(state: ResearchGraphState) -> Union[str, List[Send]]:
+    """Summarize the looked-up bill, or fall back to retrieval if it wasn't found."""
+    if state.get("reconstructed_bills"):
+        return initiate_parallel_summaries(state)
+    return "retrieve_documents"
+
+def route_grading(state: ResearchGraphState, config: RunnableConfig) -> str:
+    """Pick the pipelined or the staged grade/reconstruct/summarize path."""
+    if Configuration.from_runnable_config(config).pipelined_grading:
+        return "grade_and_summarize"
+    return "grade_documents"
+
 def set_final_research_started(state: ResearchGraphState) -> ResearchGraphState:
     """Node to set the final_research_started flag to True before compiling final research."""
     return {"final_research_started": True}
@@ -80,25 +145,52 @@ def set_final_research_started(state: ResearchGraphState) -> ResearchGraphState:
 # Graph construction
 # ---------------------------------------------------------------------------
 
-def _build_graph():
+def _build_graph(checkpointer=None):
+    """Assemble and compile the research graph.
+
+    `checkpointer` is only needed outside the LangGraph server (which supplies
+    its own); pair it with :class:`agent.serde.CompactSerializer` to keep
+    checkpoints small.
+    """
     g = StateGraph(ResearchGraphState)
 
     g.add_node("preprocess_input", preprocess_input)
     g.add_node("extract_filters", extract_filters)
+    g.add_node("check_answer_cache", check_answer_cache)
+    g.add_node("lookup_bill", lookup_bill)
     g.add_node("retrieve_documents", retrieve_documents)
+    g.add_node("next_page", next_page)
     g.add_node("grade_documents", grade_documents)
+    g.add_node("grade_and_summarize", grade_and_summarize)
     g.add_node("reconstruct_full_text", reconstruct_full_text)
     g.add_node("summarize_bills", summarize_bills)
     g.add_node("set_final_research_started", set_final_research_started)
     g.add_node("compile_final_research", compile_final_research)
     g.add_node("emit_bill_card_data", emit_bill_card_data)
+    g.add_node("store_answer", store_answer)
 
     # Linear edges
-    g.set_entry_point("preprocess_input")
+    g.set_conditional_entry_point(route_entry, ["preprocess_input", "next_page"])
     g.add_edge("preprocess_input", "extract_filters")
-    g.add_edge("extract_filters", "retrieve_documents")
-    g.add_edge("retrieve_documents", "grade_documents")
+    g.add_edge("extract_filters", "check_answer_cache")
+    g.add_conditional_edges(
+        "check_answer_cache", route_after_answer_cache, ["lookup_bill", "retrieve_documents", END]
+    )
+    # Fast path: a named bill goes straight to summarization, skipping
+    # retrieval and grading.
+    g.add_conditional_edges(
+        "lookup_bill", route_after_bill_lookup, ["summarize_bills", "retrieve_documents"]
+    )
+    g.add_conditional_edges(
+        "retrieve_documents", route_grading, ["grade_and_summarize", "grade_documents"]
+    )
+    # Follow-up pages reuse the thread's candidate pool and go straight to grading.
+    g.add_conditional_edges(
+        "next_page", route_after_next_page, ["grade_and_summarize", "grade_documents", END]
+    )
     g.add_edge("grade_documents", "reconstruct_full_text")
+    # The pipelined node has already produced every summary.
+    g.add_edge("grade_and_summarize", "set_final_research_started")
 
     # g.add_conditional_edges(
     #     "retrieve_documents", initiate_parallel_grading, ["reconstruct_full_text"]
@@ -113,9 +205,10 @@ def _build_graph():
     g.add_edge("summarize_bills", "set_final_research_started")
     g.add_edge("set_final_research_started", "compile_final_research")
     g.add_edge("compile_final_research", "emit_bill_card_data")
-    g.set_finish_point("emit_bill_card_data")
+    g.add_edge("emit_bill_card_data", "store_answer")
+    g.set_finish_point("store_answer")
 
-    return g.compile(name="agent2-research-graph")
+    return g.compile(checkpointer=checkpointer, name="agent2-research-graph")
 
 
 # Singleton compiled graph
@@ -0,0 +1,356 @@
+"""Incremental bill ingestion into ``bills_dup2`` / ``chunks_test2``.
+
+Re-ingesting a bill only re-embeds the chunks whose text actually changed:
+
+1. Bill text is split by a deterministic, content-defined chunker. Chunk
+   boundaries fall on paragraph breaks picked by a hash of the paragraph
+   itself, so an amendment only disturbs the chunks around the edit instead
+   of shifting every later boundary. ``"".join(chunks) == text`` always
+   holds, which `reconstruct_full_text` relies on.
+2. Each chunk gets a SHA-256 ``content_hash``. A chunk whose hash is already
+   stored at the same ``chunk_idx`` is skipped; one stored at another index
+   (shifted by an insertion or deletion earlier in the bill) keeps its
+   stored embedding and is only rewritten at its new index.
+3. Only new chunk text is embedded, in batches sized to the provider's
+   per-request limits, then upserted in bulk; chunks past a bill's new
+   length are deleted.
+
+Chunks are written to the canonical ``chunks_test2`` table and to every
+`VECTOR_SHARDS` table whose states/years cover the bill (see
+`agent.shards`). Requires a ``content_hash`` text column on those tables and
+a unique constraint on ``(bill_id, chunk_idx)`` for the upsert.
+
+``bills_dup2.content_hash`` (also required) is set to the hash of the full
+text; cached answers compare against it to detect re-ingested bills from
+any process (see `agent.answer_cache.stale_bills`).
+
+    python -m agent.ingest bills.jsonl   # one BillRecord JSON object per line
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple, TypedDict
+
+from agent.shards import get_shards
+
+# Canonical chunk table; `reconstruct_full_text` reads bill text from here.
+CHUNKS_TABLE = "chunks_test2"
+
+# Chunk size bounds in characters, and 1-in-N odds that a paragraph break
+# becomes a chunk boundary once the chunk has reached MIN_CHUNK_CHARS.
+MIN_CHUNK_CHARS = 800
+MAX_CHUNK_CHARS = 3000
+BOUNDARY_DIVISOR = 4
+
+# OpenAI embeddings accept at most 2048 inputs and 300k tokens per request.
+EMBED_MAX_INPUTS = 2048
+EMBED_MAX_TOKENS = 300_000
+UPSERT_BATCH_SIZE = 500
+
+_PARAGRAPH_RE = re.compile(r".*?(?:\n\s*\n|$)", re.S)
+
+
+class BillRecord(TypedDict, total=False):
+    id: str
+    bill_identifier: str
+    title: str
+    state: str
+    year: int
+    session_identifier: str
+    status: List[str]
+    full_text_url: str
+    full_text: str
+
+
+class Embedder(Protocol):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class ChunkStore(Protocol):
+    """Storage the ingester writes to (Supabase in production)."""
+
+    def existing_hashes(self, table: str, bill_ids: List[str]) -> Dict[str, Dict[int, str]]: ...
+    def embeddings_by_hash(self, table: str, bill_ids: List[str], hashes: List[str]) -> Dict[Tuple[str, str], Any]: ...
+    def upsert_bills(self, rows: List[Dict[str, Any]]) -> None: ...
+    def upsert_chunks(self, table: str, rows: List[Dict[str, Any]]) -> None: ...
+    def delete_chunks_from(self, table: str, bill_id: str, start_idx: int) -> None: ...
+
+
+@dataclass
+class IngestStats:
+    bills: int = 0
+    chunks: int = 0
+    chunks_embedded: int = 0
+    chunks_moved: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    embed_requests: int = 0
+    seconds: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+# ---------------------------------------------------------------------------
+
+def _split_long(segment: str) -> List[str]:
+    """Split an oversized paragraph into <= MAX_CHUNK_CHARS pieces at whitespace."""
+    pieces = []
+    while len(segment) > MAX_CHUNK_CHARS:
+        cut = segment.rfind(" ", MIN_CHUNK_CHARS, MAX_CHUNK_CHARS)
+        cut = cut + 1 if cut > 0 else MAX_CHUNK_CHARS
+        pieces.append(segment[:cut])
+        segment = segment[cut:]
+    if segment:
+        pieces.append(segment)
+    return pieces
+
+
+def chunk_text(text: str) -> List[str]:
+    """Split *text* into content-defined chunks that concatenate back to *text*."""
+    segments = [piece for match in _PARAGRAPH_RE.finditer(text) if match.group() for piece in _split_long(match.group())]
+    chunks: List[str] = []
+    current = ""
+    for segment in segments:
+        if current and len(current) + len(segment) > MAX_CHUNK_CHARS:
+            chunks.append(current)
+            current = ""
+        current += segment
+        if len(current) >= MIN_CHUNK_CHARS and zlib.crc32(segment.encode()) % BOUNDARY_DIVISOR == 0:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def content_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+class SupabaseChunkStore:
+    """`ChunkStore` backed by Supabase (``bills_dup2`` plus the chunk tables)."""
+
+    page_size = 1000  # PostgREST's default max rows per response
+    hash_filter_size = 100
+
+    def __init__(self, sb=None, bills_table: str = "bills_dup2") -> None:
+        if sb is None:
+            from agent.configuration import get_supabase_client
+
+            sb = get_supabase_client()
+        self.sb = sb
+        self.bills_table = bills_table
+
+    def _select_all(self, query) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        while True:
+            res = query.range(len(rows), len(rows) + self.page_size - 1).execute()
+            rows += res.data
+            if len(res.data) < self.page_size:
+                return rows
+
+    def existing_hashes(self, table: str, bill_ids: List[str]) -> Dict[str, Dict[int, str]]:
+        hashes: Dict[str, Dict[int, str]] = {bill_id: {} for bill_id in bill_ids}
+        query = (
+            self.sb.table(table)
+            .select("bill_id, chunk_idx, content_hash")
+            .in_("bill_id", bill_ids)
+            .order("bill_id")
+            .order("chunk_idx")
+        )
+        for row in self._select_all(query):
+            hashes[row["bill_id"]][row["chunk_idx"]] = row.get("content_hash") or ""
+        return hashes
+
+    def embeddings_by_hash(self, table: str, bill_ids: List[str], hashes: List[str]) -> Dict[Tuple[str, str], Any]:
+        found: Dict[Tuple[str, str], Any] = {}
+        # Hashes are 64 chars each; keep the filter well under URL length limits.
+        for start in range(0, len(hashes), self.hash_filter_size):
+            query = (
+                self.sb.table(table)
+                .select("bill_id, chunk_idx, content_hash, embedding")
+                .in_("bill_id", bill_ids)
+                .in_("content_hash", hashes[start : start + self.hash_filter_size])
+                .order("bill_id")
+                .order("chunk_idx")
+            )
+            for row in self._select_all(query):
+                found[(row["bill_id"], row["content_hash"])] = row["embedding"]
+        return found
+
+    def upsert_bills(self, rows: List[Dict[str, Any]]) -> None:
+        self.sb.table(self.bills_table).upsert(rows, on_conflict="id").execute()
+
+    def upsert_chunks(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        self.sb.table(table).upsert(rows, on_conflict="bill_id,chunk_idx").execute()
+
+    def delete_chunks_from(self, table: str, bill_id: str, start_idx: int) -> None:
+        self.sb.table(table).delete().eq("bill_id", bill_id).gte("chunk_idx", start_idx).execute()
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+
+def _embedding_batches(rows: List[Dict[str, Any]]) -> Iterable[List[Dict[str, Any]]]:
+    """Group rows into batches within the provider's input and token limits."""
+    batch: List[Dict[str, Any]] = []
+    tokens = 0
+    for row in rows:
+        # ~3 chars/token is a conservative estimate for legislative English.
+        row_tokens = len(row["chunk_text"]) // 3 + 1
+        if batch and (len(batch) >= EMBED_MAX_INPUTS or tokens + row_tokens > EMBED_MAX_TOKENS):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(row)
+        tokens += row_tokens
+    if batch:
+        yield batch
+
+
+def _chunk_metadata(bill: BillRecord) -> Dict[str, Any]:
+    return {key: value for key, value in bill.items() if key != "full_text"} | {"bill_id": bill["id"]}
+
+
+def chunk_tables(bill: BillRecord, canonical: str = CHUNKS_TABLE) -> List[str]:
+    """Return the canonical chunk table plus every shard table covering *bill*."""
+    tables = [canonical]
+    for shard in get_shards():
+        if shard.states is not None and bill.get("state") not in shard.states:
+            continue
+        if shard.years is not None and bill.get("year") not in shard.years:
+            continue
+        if shard.table_name not in tables:
+            tables.append(shard.table_name)
+    return tables
+
+
+def ingest_bills(
+    bills: Iterable[BillRecord],
+    store: Optional[ChunkStore] = None,
+    embedder: Optional[Embedder] = None,
+    bill_batch_size: int = 200,
+    chunks_table: str = CHUNKS_TABLE,
+) -> IngestStats:
+    """Upsert *bills* and re-embed only chunks whose text is new."""
+    if store is None:
+        store = SupabaseChunkStore()
+    if embedder is None:
+        from agent.configuration import get_embeddings
+
+        embedder = get_embeddings()
+
+    stats = IngestStats()
+    started = time.perf_counter()
+    changed_bills: List[str] = []
+    bills = list(bills)
+    for offset in range(0, len(bills), bill_batch_size):
+        batch = bills[offset : offset + bill_batch_size]
+        existing = store.existing_hashes(chunks_table, [bill["id"] for bill in batch])
+
+        to_embed: List[Dict[str, Any]] = []
+        moved: List[Dict[str, Any]] = []
+        stale: List[Tuple[str, int]] = []
+        tables: Dict[str, List[str]] = {}
+        for bill in batch:
+            chunks = chunk_text(bill.get("full_text") or "")
+            old = existing.get(bill["id"], {})
+            old_hashes = set(old.values())
+            metadata = _chunk_metadata(bill)
+            changed = False
+            for idx, chunk in enumerate(chunks):
+                digest = content_hash(chunk)
+                if old.get(idx) == digest:
+                    stats.chunks_unchanged += 1
+                    continue
+                changed = True
+                # Citations key chunks on metadata.chunk_idx (see agent.retrieval).
+                row = {
+                    "bill_id": bill["id"],
+                    "chunk_idx": idx,
+                    "chunk_text": chunk,
+                    "content_hash": digest,
+                    "metadata": {**metadata, "chunk_idx": idx},
+                }
+                (moved if digest in old_hashes else to_embed).append(row)
+            extra = [idx for idx in old if idx >= len(chunks)]
+            if extra:
+                changed = True
+                stale.append((bill["id"], len(chunks)))
+                stats.chunks_deleted += len(extra)
+            tables[bill["id"]] = chunk_tables(bill, chunks_table)
+            if changed:
+                changed_bills.append(bill["id"])
+            stats.chunks += len(chunks)
+
+        store.upsert_bills(
+            [
+                {k: v for k, v in bill.items() if k != "full_text"} | {"content_hash": content_hash(bill.get("full_text") or "")}
+                for bill in batch
+            ]
+        )
+
+        # Shifted chunks keep their stored embedding; only new text is embedded.
+        if moved:
+            stored = store.embeddings_by_hash(
+                chunks_table,
+                sorted({row["bill_id"] for row in moved}),
+                sorted({row["content_hash"] for row in moved}),
+            )
+            for row in moved:
+                embedding = stored.get((row["bill_id"], row["content_hash"]))
+                if embedding is None:
+                    to_embed.append(row)
+                else:
+                    row["embedding"] = embedding
+            moved = [row for row in moved if "embedding" in row]
+        for rows in _embedding_batches(to_embed):
+            vectors = embedder.embed_documents([row["chunk_text"] for row in rows])
+            stats.embed_requests += 1
+            for row, vector in zip(rows, vectors):
+                row["embedding"] = vector
+
+        by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for row in moved + to_embed:
+            for table in tables[row["bill_id"]]:
+                by_table.setdefault(table, []).append(row)
+        for table, rows in by_table.items():
+            for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                store.upsert_chunks(table, rows[start : start + UPSERT_BATCH_SIZE])
+        for bill_id, start_idx in stale:
+            for table in tables[bill_id]:
+                store.delete_chunks_from(table, bill_id, start_idx)
+
+        stats.chunks_embedded += len(to_embed)
+        stats.chunks_moved += len(moved)
+        stats.bills += len(batch)
+
+    if changed_bills:
+        from agent.answer_cache import get_answer_cache
+
+        get_answer_cache().invalidate_bills(changed_bills)
+    stats.seconds = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incrementally ingest bills from a JSONL file.")
+    parser.add_argument("path", help="JSONL file with one BillRecord per line")
+    args = parser.parse_args()
+    with open(args.path) as f:
+        bills = [json.loads(line) for line in f if line.strip()]
+    print(json.dumps(asdict(ingest_bills(bills)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
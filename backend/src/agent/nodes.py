@@ -7,14 +7,22 @@ thin and testable.
 from __future__ import annotations
 
 import operator
-from typing import Any, Dict, List, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from langchain_core.documents import Document
 from langchain_core.messages import SystemMessage, AIMessage
 from langgraph.constants import Send
 from langchain_core.runnables import RunnableConfig
 
-from agent.configuration import get_llm, get_supabase_client
-from agent.retrieval import retriever
+from agent.citations import cite
+from agent.configuration import Configuration, get_embeddings, get_llm, get_supabase_client
+from agent.ingest import content_hash
+from agent.retrieval import embed_query, search_bills
+from agent.answer_cache import filters_key, get_answer_cache, stale_bills
+from agent.prefetch import BillPrefetcher, finish_prefetch, get_prefetcher, start_prefetch
 from agent.prompts import (
     enhance_query_instructions,
     extract_filters_instructions,
@@ -24,7 +32,7 @@ from agent.prompts import (
     get_current_date,
 )
 from agent.state import ResearchGraphState, FilterResult, ReconstructedBill, BillSummary
-from agent.tools_and_schemas import DocumentGrades, BillSummaryLLM
+from agent.tools_and_schemas import DocumentGrade, DocumentGrades, BillSummaryLLM
 from agent.utils import get_research_topic
  
 
@@ -33,7 +41,8 @@ def preprocess_input(state: ResearchGraphState, config: RunnableConfig) -> Resea
     original_query = get_research_topic(state["messages"])
     print("original_query", original_query)
     enhanced_query = get_llm("gpt-4o-mini").invoke([SystemMessage(content=enhance_query_instructions.format(user_query=original_query, current_date=get_current_date))]).content
-    return {"enhanced_query": enhanced_query}
+    # A new search: drop the previous query's candidate pool.
+    return {"enhanced_query": enhanced_query, "candidates": None, "cursor": None, "continuation": False}
     
 # ---------------------------------------------------------------------------
 # 1. Extract filters
@@ -52,152 +61,523 @@ def extract_filters(state: ResearchGraphState, config: RunnableConfig) -> Resear
 
 
 # ---------------------------------------------------------------------------
-# 2. Retrieve documents
+# 1a. Semantic answer cache
 # ---------------------------------------------------------------------------
 
-def retrieve_documents(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
-    enhanced_query = state["enhanced_query"]
+def check_answer_cache(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    """Replay a prior answer whose filters match and whose query is close enough."""
+    threshold = Configuration.from_runnable_config(config).answer_cache_threshold
+    if threshold > 1:
+        return {"answer_cache_hit": False}
+    try:
+        embedding = embed_query(state["enhanced_query"])
+    except Exception as e:
+        print(f"[check_answer_cache] Could not embed query: {e}")
+        return {"answer_cache_hit": False}
+
+    cache = get_answer_cache()
+    hit = cache.lookup(embedding, filters_key(state.get("filters")), threshold)
+    if hit is None:
+        return {"answer_cache_hit": False}
+    # Bills may have been re-ingested by another process since the answer was cached.
+    try:
+        stale = stale_bills(get_supabase_client(), hit.bill_versions)
+    except Exception as e:
+        print(f"[check_answer_cache] Could not verify cached bills: {e}")
+        return {"answer_cache_hit": False}
+    if stale:
+        print(f"[check_answer_cache] Cached answer is stale (changed bills {stale})")
+        cache.invalidate_bills(stale)
+        return {"answer_cache_hit": False}
+    print(f"[check_answer_cache] Replaying cached answer for bills {sorted(hit.bill_ids)}")
+    return {
+        "answer_cache_hit": True,
+        "final_research_started": True,
+        "messages": [AIMessage(content=hit.report)],
+        "bill_card_data": hit.bill_card_data,
+        # Replace the previous run's results, which no longer match the report,
+        # and restore the cached search so "more bills" can page through it.
+        "citations": hit.citations,
+        "reconstructed_bills": [],
+        "candidates": hit.candidates,
+        "cursor": hit.cursor,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 1b. Direct bill lookup (fast path when the user names a bill)
+# ---------------------------------------------------------------------------
+
+def _normalize_identifier(identifier: str) -> str:
+    """Canonical form for comparing bill identifiers ("H.B. 123" == "hb123").
+
+    Must agree with the ``bill_identifier_normalized`` column expression.
+    """
+    return re.sub(r"[^a-z0-9]", "", identifier.lower())
+
+
+def lookup_bill(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    """Resolve `filters.bill_identifier` straight against `bills_dup2`.
+
+    Skips vector search and grading entirely: the named bill is fetched by its
+    identifier (narrowed by state/year when present) and handed to
+    summarization as the only reconstructed bill. Identifiers are compared
+    ignoring case, dots and spaces. Returns an empty list when the identifier
+    can't be resolved to exactly one bill (e.g. "H.B. 123" with no state names
+    dozens) so the graph falls back to retrieval.
+
+    Matches an indexed, generated column on ``bills_dup2``::
+
+        alter table bills_dup2 add column bill_identifier_normalized text
+            generated always as (regexp_replace(lower(bill_identifier), '[^a-z0-9]', '', 'g')) stored;
+        create index on bills_dup2 (bill_identifier_normalized, state, year);
+    """
     filters = state.get("filters")
+    if not filters or not filters.bill_identifier:
+        return {"reconstructed_bills": []}
+    wanted = _normalize_identifier(filters.bill_identifier)
+    if not wanted:
+        return {"reconstructed_bills": []}
+
+    sb = get_supabase_client()
+    query = (
+        sb.table("bills_dup2")
+        .select("id, bill_identifier, title, state, year, session_identifier, status, full_text_url")
+        .eq("bill_identifier_normalized", wanted)
+    )
+    if filters.state:
+        query = query.eq("state", filters.state)
+    if filters.year:
+        query = query.in_("year", filters.year)
+
+    try:
+        # Every row is an exact match, so two are enough to tell it isn't unique.
+        matches = query.order("year", desc=True).limit(2).execute().data
+        if len(matches) != 1:
+            reason = "No bill found" if not matches else f"{len(matches)} bills match"
+            print(f"[lookup_bill] {reason} for {filters.bill_identifier}, falling back to retrieval")
+            return {"reconstructed_bills": []}
+        row = matches[0]
+        full_text = _fetch_chunk_text(sb, row["id"])
+    except Exception as e:
+        print(f"[lookup_bill] Exception resolving {filters.bill_identifier}: {e}")
+        return {"reconstructed_bills": []}
+    if not full_text:
+        return {"reconstructed_bills": []}
 
+    bill: ReconstructedBill = {
+        "id": row["id"],
+        "bill_identifier": row.get("bill_identifier") or filters.bill_identifier,
+        "year": row.get("year", 0),
+        "state": row.get("state", "N/A"),
+        "title": row.get("title", "N/A"),
+        "session_identifier": row.get("session_identifier", "N/A"),
+        "similarity_score": 1.0,
+        "status": row.get("status") or [],
+        "full_text": full_text,
+        "full_text_url": row.get("full_text_url"),
+    }
+    # No candidate pool yet: a "more bills" follow-up searches then (see `next_page`).
+    return {"reconstructed_bills": [bill], "cursor": {"offset": 0, "verdicts": {}, "summarized": [bill["id"]]}}
+
+
+# ---------------------------------------------------------------------------
+# 2. Retrieve documents
+# ---------------------------------------------------------------------------
+
+# How many top-scoring bills to prefetch text for while grading runs.
+PREFETCH_TOP_N = 8
+
+# Distinct bills kept in the thread's ranked candidate pool, and how many of
+# them each page grades. "More bills" follow-ups page through the pool (see
+# `next_page`) instead of searching again.
+CANDIDATE_POOL_SIZE = 60
+GRADE_PAGE_SIZE = 20
+
+# Grading only reads this much of each chunk, so candidates keep no more.
+SNIPPET_CHARS = 500
+
+
+def _start_page_prefetch(page: List[Tuple[Document, float]]) -> str:
+    """Start pulling the likeliest bills' text so it's ready when grading finishes."""
+    ranked = sorted(page, key=lambda hit: hit[1], reverse=True)
+    bill_ids = [doc.metadata["bill_id"] for doc, _ in ranked if doc.metadata.get("bill_id")]
+    return start_prefetch(partial(_fetch_bill, get_supabase_client()), bill_ids[:PREFETCH_TOP_N])
+
+
+def _search_candidates(state: ResearchGraphState) -> Tuple[List[Tuple[Document, float]], Dict[str, int]]:
+    """Return the ranked candidate pool (snippets) for the state's query and filters."""
+    filters = state.get("filters")
     filter_kwargs: Dict[str, Any] = {}
     if filters and filters.state:
         filter_kwargs["state"] = filters.state
 
-    docs = retriever.invoke({"query": enhanced_query, "k": 20, "filters": filter_kwargs or None})
-    return {"retrieved_docs": docs}
+    # k counts distinct bills; duplicate chunks of the same bill are collapsed
+    # so grading, reconstruction and summarization see each bill once.
+    docs, stats = search_bills(
+        state["enhanced_query"], k=CANDIDATE_POOL_SIZE, filters=filter_kwargs or None, filter_result=filters
+    )
+    candidates = [(Document(page_content=doc.page_content[:SNIPPET_CHARS], metadata=doc.metadata), score) for doc, score in docs]
+    return candidates, stats
+
+
+def retrieve_documents(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    candidates, stats = _search_candidates(state)
+    print(f"[retrieve_documents] {stats}")
+    page = candidates[:GRADE_PAGE_SIZE]
+    return {
+        "retrieved_docs": page,
+        "retrieval_stats": stats,
+        "prefetch_key": _start_page_prefetch(page),
+        "candidates": candidates,
+        "cursor": {"offset": len(page), "verdicts": {}, "summarized": []},
+    }
+
+
+# ---------------------------------------------------------------------------
+# 2a. Next page of a previous search
+# ---------------------------------------------------------------------------
+
+def next_page(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    """Grade the next unseen slice of the thread's candidate pool.
+
+    Reuses the previous run's enhanced query, filters and ranked candidates,
+    so a "more bills" follow-up skips query enhancement, filter extraction,
+    embedding and vector search. Bills already graded or summarized in this
+    thread are skipped. After a direct bill lookup there is no pool yet, so
+    the first follow-up runs the search once (minus the bill already shown).
+    """
+    cursor = state["cursor"]
+    candidates = state.get("candidates")
+    searched: Dict[str, Any] = {}
+    if candidates is None:
+        candidates, stats = _search_candidates(state)
+        print(f"[next_page] {stats}")
+        searched = {"candidates": candidates, "retrieval_stats": stats}
+    seen = set(cursor["verdicts"]) | set(cursor["summarized"])
+    offset = cursor["offset"]
+    page: List[Tuple[Document, float]] = []
+    while offset < len(candidates) and len(page) < GRADE_PAGE_SIZE:
+        doc, score = candidates[offset]
+        offset += 1
+        if doc.metadata.get("bill_id") not in seen:
+            page.append((doc, score))
+
+    update = {
+        **searched,
+        "cursor": {**cursor, "offset": offset},
+        "continuation": True,
+        "answer_cache_hit": False,
+        "final_research_started": False,
+        "citations": None,
+    }
+    print(f"[next_page] grading candidates {cursor['offset']}..{offset} of {len(candidates)}")
+    if not page:
+        return {
+            **update,
+            "retrieved_docs": [],
+            "final_research_started": True,
+            "bill_card_data": [],
+            "messages": [AIMessage(content="There are no more matching bills for this search. Try broadening or rephrasing your question.")],
+        }
+    return {**update, "retrieved_docs": page, "prefetch_key": _start_page_prefetch(page)}
 
 
 # ---------------------------------------------------------------------------
 # 3. Grade documents
 # ---------------------------------------------------------------------------
-def grade_documents(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
-    enhanced_query = state["enhanced_query"]
-    retrieved_docs = state.get("retrieved_docs", [])
-    # print(f"state: {state}")
-    if not retrieved_docs:
-        return {"graded_docs": []}
 
+def _grading_prompt(enhanced_query: str, retrieved_docs: List[Tuple[Any, float]]) -> str:
     snippets = []
     for idx, (doc, score) in enumerate(retrieved_docs):
         snippets.append(
-            f"Index: {idx}\nTitle: {doc.metadata.get('title')}\nSnippet: {doc.page_content[:500]}\nScore: {score:.3f}\n---"
+            f"Index: {idx}\nTitle: {doc.metadata.get('title')}\nSnippet: {doc.page_content[:SNIPPET_CHARS]}\nScore: {score:.3f}\n---"
         )
-    context = "\n".join(snippets)
-    # print(f"context: {context}")
-
-    prompt = grade_documents_instructions.format(
+    return grade_documents_instructions.format(
         user_query=enhanced_query,
-        doc_context=context,
+        doc_context="\n".join(snippets),
     )
-    grades = get_llm("gpt-4o-mini").with_structured_output(DocumentGrades).invoke([SystemMessage(content=prompt)])
-    # print(f"grades: {grades}")
 
-    # Create a list of graded documents with full metadata
+
+def _graded_doc(retrieved_docs: List[Tuple[Any, float]], grade: DocumentGrade) -> Dict[str, Any]:
+    """Return the graded-doc record for a relevant *grade*, with full metadata."""
+    doc, score = retrieved_docs[grade.doc_index]
+    return {
+        "doc": doc,
+        "score": score,
+        "is_relevant": grade.is_relevant,
+        "reasoning": grade.reasoning,
+        "doc_index": grade.doc_index,
+        "title": doc.metadata.get("title", "N/A"),
+    }
+
+
+def _valid_grade(retrieved_docs: List[Tuple[Any, float]], grade: DocumentGrade) -> bool:
+    """Return False (and log) for a grade whose doc_index isn't on the page."""
+    if 0 <= grade.doc_index < len(retrieved_docs):
+        return True
+    print(f"[grading] Ignoring grade for unknown doc_index {grade.doc_index}")
+    return False
+
+
+def _bill_id_at(retrieved_docs: List[Tuple[Any, float]], doc_index: int) -> Optional[str]:
+    if 0 <= doc_index < len(retrieved_docs):
+        return retrieved_docs[doc_index][0].metadata.get("bill_id")
+    return None
+
+
+def _advance_cursor(
+    state: ResearchGraphState, verdicts: Optional[Dict[str, bool]] = None, summarized: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """Return the thread's cursor with new grading verdicts and summarized bill_ids."""
+    cursor = state.get("cursor")
+    if cursor is None:
+        return None
+    done = cursor["summarized"]
+    return {
+        **cursor,
+        "verdicts": {**cursor["verdicts"], **(verdicts or {})},
+        "summarized": done + [bill_id for bill_id in summarized or [] if bill_id not in done],
+    }
+
+
+def grade_documents(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    enhanced_query = state["enhanced_query"]
+    retrieved_docs = state.get("retrieved_docs") or []
+    if not retrieved_docs:
+        return {"graded_docs": []}
+
+    prompt = _grading_prompt(enhanced_query, retrieved_docs)
+    try:
+        grades = get_llm("gpt-4o-mini").with_structured_output(DocumentGrades).invoke([SystemMessage(content=prompt)])
+    except BaseException:
+        # The run stops here, so reconstruction won't release the prefetcher.
+        finish_prefetch(state.get("prefetch_key"))
+        raise
+
+    prefetcher = get_prefetcher(state.get("prefetch_key"))
     graded_docs = []
-    # print(f"grades: {grades}")
-    # print(f"grades.grades: {grades.grades}")
+    verdicts: Dict[str, bool] = {}
     for grade in grades.grades:
         print(f"grade: {grade}")
-        print(f"grade.is_relevant: {grade.is_relevant}")
+        if not _valid_grade(retrieved_docs, grade):
+            continue
+        bill_id = _bill_id_at(retrieved_docs, grade.doc_index)
+        if bill_id:
+            verdicts[bill_id] = grade.is_relevant
         if grade.is_relevant:
-            doc, score = retrieved_docs[grade.doc_index]
-            graded_docs.append({
-                "doc": doc,
-                "score": score,
-                "is_relevant": grade.is_relevant,
-                "reasoning": grade.reasoning,
-                "doc_index": grade.doc_index,
-                "title": doc.metadata.get("title", "N/A")
-            })
-    
-    # print(f"graded_docs: {graded_docs}")
+            graded_docs.append(_graded_doc(retrieved_docs, grade))
+        elif prefetcher:
+            prefetcher.cancel([bill_id])
 
-    return {"graded_docs": graded_docs}
+    return {"graded_docs": graded_docs, "cursor": _advance_cursor(state, verdicts)}
 
 
 # ---------------------------------------------------------------------------
 # 4. Reconstruct full bill text
 # ---------------------------------------------------------------------------
 
+def _fetch_chunk_text(sb, bill_id: str) -> str:
+    """Return the bill's full text: its chunks concatenated in ``chunk_idx`` order."""
+    res = sb.table("chunks_test2").select("chunk_text").eq("bill_id", bill_id).order("chunk_idx").execute()
+    return "".join(chunk.get("chunk_text", "") for chunk in res.data)
+
+
+def _fetch_full_text_url(sb, bill_id: str) -> Optional[str]:
+    """Return the bill's ``full_text_url`` from ``bills_dup2``, or ``None``."""
+    try:
+        bill_url_res = sb.table("bills_dup2").select("full_text_url").eq("id", bill_id).execute()
+        if bill_url_res.data:
+            return bill_url_res.data[0].get("full_text_url")
+        print(f"[reconstruct_full_text] No full_text_url found for bill_id={bill_id}")
+    except Exception as e:
+        print(f"[reconstruct_full_text] Exception fetching full_text_url for bill_id={bill_id}: {e}")
+    return None
+
+
+def _fetch_bill(sb, bill_id: str) -> Tuple[str, Optional[str]]:
+    return _fetch_chunk_text(sb, bill_id), _fetch_full_text_url(sb, bill_id)
+
+
+def _reconstruct_bill(sb, graded_doc: Dict[str, Any], prefetcher: Optional[BillPrefetcher] = None) -> ReconstructedBill:
+    """Build the reconstructed bill for a graded doc, preferring prefetched text."""
+    doc = graded_doc["doc"]
+    bill_id = doc.metadata["bill_id"]
+    fetched = prefetcher.get(bill_id) if prefetcher else None
+    full_text, full_text_url = fetched or _fetch_bill(sb, bill_id)
+    return {
+        "id": bill_id,
+        "bill_identifier": doc.metadata.get("bill_identifier", "N/A"),
+        "year": doc.metadata.get("year", 0),
+        "state": doc.metadata.get("state", "N/A"),
+        "title": doc.metadata.get("title", "N/A"),
+        "session_identifier": doc.metadata.get("session_identifier", "N/A"),
+        "similarity_score": graded_doc["score"],
+        "status": doc.metadata.get("status", []),
+        "full_text": full_text,
+        "full_text_url": full_text_url,
+    }
+
+
 def reconstruct_full_text(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
     graded_docs = state.get("graded_docs", [])
+    prefetch_key = state.get("prefetch_key")
     if not graded_docs:
-        return {"reconstructed_bills": []}
+        return {"reconstructed_bills": [], "retrieved_docs": None, "prefetch_stats": finish_prefetch(prefetch_key)}
 
     sb = get_supabase_client()
+    prefetcher = get_prefetcher(prefetch_key)
     bills: List[ReconstructedBill] = []
+    seen: set = set()
     for gd in graded_docs:
-        doc = gd["doc"]
-        bill_id = doc.metadata.get("bill_id")
-        if not bill_id:
+        bill_id = gd["doc"].metadata.get("bill_id")
+        if not bill_id or bill_id in seen:
             continue
-        
-        res = sb.table("chunks_test2").select("*").eq("bill_id", bill_id).order("chunk_idx").execute()
-        full_text = "".join(chunk.get("chunk_text", "") for chunk in res.data)
-        print(f"full_text: yes" if full_text else "no")
-
-        # Fetch full_text_url from bills_dup2
-        bill_url_res = sb.table("bills_dup2").select("full_text_url").eq("id", bill_id).execute()
-        print(f"bill_url_res: {bill_url_res}")
-        full_text_url = None
-        try:
-            if bill_url_res.data and len(bill_url_res.data) > 0:
-                full_text_url = bill_url_res.data[0].get("full_text_url")
-                print("Bill data:", bill_url_res.data[0])
-            else:
-                print(f"[reconstruct_full_text] No full_text_url found for bill_id={bill_id}")
-        except Exception as e:
-            print(f"[reconstruct_full_text] Exception fetching full_text_url for bill_id={bill_id}: {e}")
-
-        bills.append(
-            {
-                "id": bill_id,
-                "bill_identifier": doc.metadata.get("bill_identifier", "N/A"),
-                "year": doc.metadata.get("year", 0),
-                "state": doc.metadata.get("state", "N/A"),
-                "title": doc.metadata.get("title", "N/A"),
-                "session_identifier": doc.metadata.get("session_identifier", "N/A"),
-                "similarity_score": gd["score"],
-                "status": doc.metadata.get("status", []),
-                "full_text": full_text,
-                "full_text_url": full_text_url,
-            }
-        )
-    return {"reconstructed_bills": bills}
+        seen.add(bill_id)
+        bills.append(_reconstruct_bill(sb, gd, prefetcher))
+
+    prefetch_stats = finish_prefetch(prefetch_key)
+    print(f"[reconstruct_full_text] prefetch {prefetch_stats}")
+    # retrieved_docs/graded_docs have no readers past this point; clearing them
+    # keeps every later checkpoint from re-serializing the Documents.
+    return {
+        "reconstructed_bills": bills,
+        "retrieved_docs": None,
+        "graded_docs": [],
+        "prefetch_stats": prefetch_stats,
+        "cursor": _advance_cursor(state, summarized=[bill["id"] for bill in bills]),
+    }
 
 
 # ---------------------------------------------------------------------------
 # 6. Summarize a bill (runs in parallel)
 # ---------------------------------------------------------------------------
 
-def summarize_bills(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
-    bill = state["bill_to_summarize"] # This comes from the Send payload
+def _summarize_bill(bill: Dict[str, Any], enhanced_query: str) -> BillSummary:
+    """Summarize one ``bill_to_summarize`` payload (bill_id, title, full_text)."""
     prompt = summarize_bills_instructions.format(
-        user_query=state["enhanced_query"],
+        user_query=enhanced_query,
         title=bill["title"],
         truncated_text=bill["full_text"][:10000],
     )
     llm = get_llm("gpt-4o-mini").with_structured_output(BillSummaryLLM)
     summary = llm.invoke([SystemMessage(content=prompt)])
-    summary_text = summary
-    # print(summary_text)
-        
-    bill_summary_output: BillSummary = {
+    return {
         "bill_id": bill["bill_id"],
         "title": bill["title"],
-        "summary_text": summary_text,
+        "summary_text": summary,
         "one_line_summary": ""
     }
+
+
+def summarize_bills(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    bill = state["bill_to_summarize"] # This comes from the Send payload
+    bill_summary_output = _summarize_bill(bill, state["enhanced_query"])
     return {"bill_summaries": [bill_summary_output]} # operator.add appends this list
 
 
+# ---------------------------------------------------------------------------
+# 3-6 pipelined: grade -> reconstruct -> summarize as grades stream in
+# ---------------------------------------------------------------------------
+
+# Concurrent reconstruct+summarize tasks while grades are still streaming.
+PIPELINE_WORKERS = 8
+
+
+def _stream_grades(prompt: str) -> Iterator[DocumentGrade]:
+    """Yield each `DocumentGrade` as soon as the LLM has finished writing it.
+
+    The structured output is streamed as partial JSON; a grade is complete
+    once the next one has started (or the stream has ended).
+    """
+    llm = get_llm("gpt-4o-mini").with_structured_output(DocumentGrades.model_json_schema())
+    grades: List[Dict[str, Any]] = []
+    emitted = 0
+    for chunk in llm.stream([SystemMessage(content=prompt)]):
+        grades = (chunk or {}).get("grades") or []
+        while emitted < len(grades) - 1:
+            yield DocumentGrade.model_validate(grades[emitted])
+            emitted += 1
+    for raw in grades[emitted:]:
+        yield DocumentGrade.model_validate(raw)
+
+
+def _reconstruct_and_summarize(
+    sb, graded_doc: Dict[str, Any], enhanced_query: str, prefetcher: Optional[BillPrefetcher]
+) -> Tuple[ReconstructedBill, BillSummary]:
+    bill = _reconstruct_bill(sb, graded_doc, prefetcher)
+    summary = _summarize_bill(
+        {"bill_id": bill["id"], "title": bill["title"], "full_text": bill["full_text"]},
+        enhanced_query,
+    )
+    return bill, summary
+
+
+def grade_and_summarize(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    """Pipelined equivalent of grade_documents -> reconstruct_full_text -> summarize_bills.
+
+    Each relevant grade is dispatched for text reconstruction and summarization
+    the moment it is parsed from the streaming grader output, so database and
+    summarization latency overlap with the rest of grading. Produces the same
+    `reconstructed_bills` (in grade order) and `bill_summaries` as the staged path.
+    """
+    enhanced_query = state["enhanced_query"]
+    retrieved_docs = state.get("retrieved_docs") or []
+    if not retrieved_docs:
+        return {"reconstructed_bills": [], "retrieved_docs": None, "graded_docs": [], "prefetch_stats": finish_prefetch(state.get("prefetch_key"))}
+
+    sb = get_supabase_client()
+    prefetch_key = state.get("prefetch_key")
+    prefetcher = get_prefetcher(prefetch_key)
+    seen: set = set()
+    verdicts: Dict[str, bool] = {}
+    futures = []
+    # Release the prefetcher even if grading or a summary fails.
+    try:
+        with ThreadPoolExecutor(max_workers=PIPELINE_WORKERS) as pool:
+            for grade in _stream_grades(_grading_prompt(enhanced_query, retrieved_docs)):
+                print(f"grade: {grade}")
+                if not _valid_grade(retrieved_docs, grade):
+                    continue
+                graded_id = _bill_id_at(retrieved_docs, grade.doc_index)
+                if graded_id:
+                    verdicts[graded_id] = grade.is_relevant
+                if not grade.is_relevant:
+                    if prefetcher:
+                        prefetcher.cancel([graded_id])
+                    continue
+                gd = _graded_doc(retrieved_docs, grade)
+                bill_id = gd["doc"].metadata.get("bill_id")
+                if not bill_id or bill_id in seen:
+                    continue
+                seen.add(bill_id)
+                futures.append(pool.submit(_reconstruct_and_summarize, sb, gd, enhanced_query, prefetcher))
+            results = [f.result() for f in futures]
+    finally:
+        prefetch_stats = finish_prefetch(prefetch_key)
+    print(f"[grade_and_summarize] prefetch {prefetch_stats}")
+    bills = [bill for bill, _ in results]
+    return {
+        "reconstructed_bills": bills,
+        "bill_summaries": [summary for _, summary in results],
+        "retrieved_docs": None,
+        "graded_docs": [],
+        "prefetch_stats": prefetch_stats,
+        "cursor": _advance_cursor(state, verdicts, [bill["id"] for bill in bills]),
+    }
+
+
 # ---------------------------------------------------------------------------
 # 7. Compile final research
 # ---------------------------------------------------------------------------
 
 def compile_final_research(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
     print(f"state: {state.get('final_research_started')}")
-    summaries = state.get("bill_summaries", [])
+    # bill_summaries accumulates across a thread's runs; report on this run's bills,
+    # using each bill's latest summary (as emit_bill_card_data does).
+    latest = {bs["bill_id"]: bs for bs in state.get("bill_summaries", [])}
+    current = dict.fromkeys(bill["id"] for bill in state.get("reconstructed_bills") or [])
+    summaries = [latest[bill_id] for bill_id in current if bill_id in latest]
     if not summaries:
         return {"final_research": "No relevant bill summaries were generated."}
 
@@ -210,11 +590,27 @@ def compile_final_research(state: ResearchGraphState, config: RunnableConfig) ->
     )
     report = get_llm("gpt-4o-mini").invoke([SystemMessage(content=prompt)])
     print(f"report: {report.content}")
-    return {"messages": [AIMessage(content=report.content)]}
+
+    # Ground sentences in the chunks retrieval already embedded (no LLM call).
+    content, citations = report.content, []
+    threshold = Configuration.from_runnable_config(config).citation_threshold
+    if threshold <= 1:
+        try:
+            content, citations = cite(
+                report.content, state.get("reconstructed_bills") or [], get_embeddings().embed_documents, threshold
+            )
+        except Exception as e:
+            print(f"[compile_final_research] Could not add citations: {e}")
+    print(f"[compile_final_research] {len(citations)} cited sentences")
+    return {"messages": [AIMessage(content=content)], "citations": citations}
 
 
 def emit_bill_card_data(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
-    """Join reconstructed_bills and bill_summaries, emit top 5 as BillCardData."""
+    """Join reconstructed_bills and bill_summaries into BillCardData, best match first.
+
+    Every bill of the current page gets a card; further bills come from a
+    "more bills" follow-up (see `next_page`) rather than being cut here.
+    """
     reconstructed_bills = state.get("reconstructed_bills", [])
     bill_summaries = state.get("bill_summaries", [])
     # print(f"reconstructed_bills: {reconstructed_bills}")
@@ -223,7 +619,7 @@ def emit_bill_card_data(state: ResearchGraphState, config: RunnableConfig) -> Re
     # Build a lookup for summaries by bill_id
     summary_lookup = {s.get("bill_id"): s for s in bill_summaries}
     card_data_list = []
-    for bill in reconstructed_bills:
+    for bill in sorted(reconstructed_bills, key=lambda b: b.get("similarity_score") or 0, reverse=True):
         bill_id = bill.get("id")
         summary = summary_lookup.get(bill_id, {})
         card_data = {
@@ -239,8 +635,31 @@ def emit_bill_card_data(state: ResearchGraphState, config: RunnableConfig) -> Re
             "fullSummaryText": summary.get("summary_text", ""),
         }
         card_data_list.append(card_data)
-    # Sort or filter top 5 if needed (e.g., by similarity_score)
-    card_data_list = card_data_list[:5]
     return {"bill_card_data": card_data_list}
 
 
+def store_answer(state: ResearchGraphState, config: RunnableConfig) -> ResearchGraphState:
+    """Record this run's report and bill cards in the semantic answer cache."""
+    messages = state.get("messages") or []
+    cards = state.get("bill_card_data") or []
+    # A later page answers "more bills", not the original question.
+    if state.get("continuation") or not cards or not messages or not isinstance(messages[-1], AIMessage):
+        return {}
+    try:
+        embedding = embed_query(state["enhanced_query"])
+    except Exception as e:
+        print(f"[store_answer] Could not embed query: {e}")
+        return {}
+    # The same hash agent.ingest stores on bills_dup2, for stale checks on replay.
+    bill_versions = {bill["id"]: content_hash(bill["full_text"]) for bill in state.get("reconstructed_bills") or []}
+    get_answer_cache().store(
+        embedding,
+        filters_key(state.get("filters")),
+        messages[-1].content,
+        cards,
+        bill_versions,
+        citations=state.get("citations"),
+        candidates=state.get("candidates"),
+        cursor=state.get("cursor"),
+    )
+    return {}
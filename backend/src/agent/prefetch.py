@@ -0,0 +1,161 @@
+"""Speculative prefetch of bill text while grading waits on the LLM.
+
+As soon as retrieval finishes we already know the best-scoring bill_ids, so
+their chunk text and `full_text_url` are fetched in the background. The
+reconstruction step then takes results from the prefetcher instead of
+hitting Supabase again, and bills graded irrelevant are cancelled.
+
+Prefetchers live in this process only and are looked up by the key stored in
+`ResearchGraphState.prefetch_key`; a run resumed elsewhere simply misses and
+fetches directly. A run that fails or is cancelled before reconstruction
+never calls `finish_prefetch`, so registrations also expire after
+``REGISTRY_TTL_SECONDS`` and the registry keeps at most
+``MAX_REGISTERED`` of them; evicted prefetchers are cancelled.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+BillText = Tuple[str, Optional[str]]
+
+# Far longer than grading takes; only abandoned runs ever reach it.
+REGISTRY_TTL_SECONDS = 600
+MAX_REGISTERED = 256
+
+# Shared across runs so concurrent graphs don't each spin up their own pool.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bill-prefetch")
+# key -> (registration time, prefetcher), oldest first
+_prefetchers: "OrderedDict[str, Tuple[float, BillPrefetcher]]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def _size(result: BillText) -> int:
+    full_text, full_text_url = result
+    return len(full_text.encode()) + len((full_text_url or "").encode())
+
+
+class BillPrefetcher:
+    """Map of bill_id -> in-flight fetch of ``(full_text, full_text_url)``."""
+
+    def __init__(self, fetch: Callable[[str], BillText]) -> None:
+        self._fetch = fetch
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.prefetched = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.wasted_bytes = 0
+
+    def prefetch(self, bill_ids: Iterable[str]) -> None:
+        with self._lock:
+            for bill_id in bill_ids:
+                if bill_id not in self._futures:
+                    self._futures[bill_id] = _executor.submit(self._fetch, bill_id)
+                    self.prefetched += 1
+
+    def get(self, bill_id: str) -> Optional[BillText]:
+        """Return the prefetched text for *bill_id*, waiting if still in flight.
+
+        Returns ``None`` on a miss (never prefetched, cancelled or failed); the
+        caller should then fetch directly.
+        """
+        with self._lock:
+            future = self._futures.pop(bill_id, None)
+        result = None
+        if future is not None and not future.cancelled():
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[prefetch] fetch failed for bill_id={bill_id}: {e}")
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def cancel(self, bill_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop prefetches for *bill_ids* (all remaining ones by default).
+
+        Fetches that haven't started are cancelled; ones already running or
+        done count their bytes as wasted (once they finish, so a fetch still
+        running when stats are read isn't included yet).
+        """
+        with self._lock:
+            ids = list(self._futures) if bill_ids is None else [b for b in bill_ids if b in self._futures]
+            futures = [self._futures.pop(bill_id) for bill_id in ids]
+        for future in futures:
+            if future.cancel():
+                with self._lock:
+                    self.cancelled += 1
+            else:
+                future.add_done_callback(self._count_waste)
+
+    def _count_waste(self, future: Future) -> None:
+        if future.exception() is None:
+            with self._lock:
+                self.wasted_bytes += _size(future.result())
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.hits + self.misses
+        return {
+            "prefetched": self.prefetched,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "wasted_bytes": self.wasted_bytes,
+            "hit_rate_pct": round(100 * self.hits / lookups) if lookups else 0,
+        }
+
+
+def start_prefetch(fetch: Callable[[str], BillText], bill_ids: Iterable[str]) -> str:
+    """Start prefetching *bill_ids* and return the key to find the prefetcher by."""
+    prefetcher = BillPrefetcher(fetch)
+    prefetcher.prefetch(bill_ids)
+    key = uuid.uuid4().hex
+    now = time.monotonic()
+    with _registry_lock:
+        _prefetchers[key] = (now, prefetcher)
+        evicted = _evict(now)
+    for stale in evicted:
+        stale.cancel()
+    return key
+
+
+def _evict(now: float) -> List[BillPrefetcher]:
+    """Unregister expired and over-capacity prefetchers; caller holds the lock."""
+    evicted = []
+    while _prefetchers:
+        key, (registered, prefetcher) = next(iter(_prefetchers.items()))
+        if registered > now - REGISTRY_TTL_SECONDS and len(_prefetchers) <= MAX_REGISTERED:
+            break
+        del _prefetchers[key]
+        evicted.append(prefetcher)
+    return evicted
+
+
+def get_prefetcher(key: Optional[str]) -> Optional[BillPrefetcher]:
+    if not key:
+        return None
+    with _registry_lock:
+        entry = _prefetchers.get(key)
+    return entry[1] if entry else None
+
+
+def finish_prefetch(key: Optional[str]) -> Optional[Dict[str, int]]:
+    """Cancel whatever is left for *key*, unregister it and return its stats."""
+    if not key:
+        return None
+    with _registry_lock:
+        entry = _prefetchers.pop(key, None)
+    if entry is None:
+        return None
+    prefetcher = entry[1]
+    prefetcher.cancel()
+    return prefetcher.stats()
@@ -1,27 +1,151 @@
-"""Retriever tool and query-enhancement helpers."""
+"""Retriever tool and query-enhancement helpers.
+
+Bill diversification (MMR) and report citations both use the chunk
+embeddings the vector store returns, so each shard's search function
+(``search_bill_chunks_langchain`` by default) must select the chunk's
+``embedding`` column alongside ``id``, ``content``, ``metadata`` and
+``similarity``. When it doesn't, retrieval still works: bills are collapsed
+by score alone and the report goes uncited.
+
+Citations also identify chunks by ``metadata.bill_id`` and
+``metadata.chunk_idx``. `agent.ingest` writes both into each row's metadata;
+for rows loaded before it did, have the search function return
+``metadata || jsonb_build_object('chunk_idx', chunk_idx)``. Chunks missing
+either key are not cited.
+"""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.tools import tool
 
-from .configuration import get_vector_store
+from .citations import remember_chunks
+from .configuration import get_embeddings, get_vector_store
+from .shards import Shard, select_shards
+from .state import FilterResult
 
+# How many raw chunks to pull per requested bill before collapsing by bill_id.
+FETCH_MULTIPLIER = 3
 
-@tool
-def retriever(query: str, k: int = 20, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
-    """Return (doc, score) tuples from Supabase.
+# Shared pool for scatter-gather shard queries.
+_shard_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="shard-search")
+
+
+@lru_cache(maxsize=256)
+def embed_query(query: str) -> Tuple[float, ...]:
+    """Return (and cache) the embedding for *query*.
+
+    Shared by the answer cache and retrieval so a run embeds its query once.
+    """
+    return tuple(get_embeddings().embed_query(query))
+
+
+def diversify_by_bill(
+    hits: List[Tuple[Document, float, Any]],
+    k: int,
+    per_bill: int = 1,
+    query_embedding: Optional[List[float]] = None,
+    lambda_mult: float = 0.5,
+) -> Tuple[List[Tuple[Document, float]], Dict[str, int]]:
+    """Collapse chunk hits to at most *per_bill* chunks for each of *k* bills.
+
+    `hits` are ``(doc, score, embedding)`` tuples ordered best-first. Chunks are
+    grouped by ``bill_id``; when a query embedding is given and every bill's
+    best chunk carries an embedding of the same size, bills are picked with
+    MMR over those embeddings, otherwise by best score.
 
-    `filters` is a simple metadata-equality dict passed straight to
-    `similarity_search_with_relevance_scores`.
+    Returns the kept ``(doc, score)`` pairs and a stats dict describing how
+    many duplicate chunks were collapsed.
     """
+    groups: Dict[str, List[Tuple[Document, float, Any]]] = {}
+    for doc, score, embedding in hits:
+        # Chunks without a bill_id can't be collapsed, so each is its own group.
+        bill_id = doc.metadata.get("bill_id") or id(doc)
+        groups.setdefault(bill_id, []).append((doc, score, embedding))
+    for chunks in groups.values():
+        chunks.sort(key=lambda hit: hit[1], reverse=True)
 
-    vector_store = get_vector_store()
-    if filters:
-        # Exact-match metadata filtering
-        similar = vector_store.similarity_search_with_relevance_scores(query, k, filter=filters)
+    bill_ids = sorted(groups, key=lambda b: groups[b][0][1], reverse=True)
+    heads = [groups[b][0][2] for b in bill_ids]
+    use_mmr = query_embedding is not None and len(bill_ids) > k
+    if use_mmr and not all(head is not None and len(head) == len(query_embedding) for head in heads):
+        print("[diversify_by_bill] search results carry no chunk embeddings; collapsing by score")
+        use_mmr = False
+    if use_mmr:
+        import numpy as np
+        from langchain_core.vectorstores.utils import maximal_marginal_relevance
+
+        picked = maximal_marginal_relevance(
+            np.array(query_embedding, dtype=np.float32), heads, lambda_mult=lambda_mult, k=k
+        )
+        bill_ids = [bill_ids[i] for i in picked]
     else:
-        # No filtering
-        similar = vector_store.similarity_search_with_relevance_scores(query, k)
-    return similar
+        bill_ids = bill_ids[:k]
+
+    kept = [(doc, score) for b in bill_ids for doc, score, _ in groups[b][:per_bill]]
+
+    # What the undiversified top-k would have contained: every extra chunk of an
+    # already-seen bill is one redundant grade/reconstruction/summary.
+    top_k_bills = {doc.metadata.get("bill_id") for doc, _, _ in hits[:k]}
+    stats = {
+        "fetched_chunks": len(hits),
+        "distinct_bills": len(groups),
+        "returned_bills": len(bill_ids),
+        "returned_chunks": len(kept),
+        "duplicate_summaries_avoided": min(k, len(hits)) - len(top_k_bills),
+    }
+    return kept, stats
+
+
+def _search_shard(
+    shard: Shard, query_embedding: List[float], fetch_k: int, filters: Optional[Dict[str, Any]]
+) -> List[Tuple[Document, float, Any]]:
+    vector_store = get_vector_store(shard.table_name, shard.query_name)
+    return vector_store.similarity_search_by_vector_returning_embeddings(query_embedding, fetch_k, filter=filters or None)
+
+
+def search_bills(
+    query: str,
+    k: int = 20,
+    filters: Optional[Dict[str, Any]] = None,
+    per_bill: int = 1,
+    fetch_k: Optional[int] = None,
+    lambda_mult: float = 0.5,
+    filter_result: Optional[FilterResult] = None,
+) -> Tuple[List[Tuple[Document, float]], Dict[str, int]]:
+    """Over-fetch chunks and return (doc, score) pairs for *k* distinct bills.
+
+    Shards ruled out by `filter_result` are skipped; the rest are searched in
+    parallel and merged into a global top-``fetch_k`` before collapsing (see
+    `diversify_by_bill`). The second element of the returned tuple is its
+    stats dict, plus the number of shards queried.
+    """
+    query_embedding = list(embed_query(query))
+    fetch_k = fetch_k or k * FETCH_MULTIPLIER
+    shards = select_shards(filter_result)
+    if len(shards) == 1:
+        hits = _search_shard(shards[0], query_embedding, fetch_k, filters)
+    else:
+        futures = [_shard_pool.submit(_search_shard, shard, query_embedding, fetch_k, filters) for shard in shards]
+        hits = [hit for future in futures for hit in future.result()]
+    # Each shard returned its own top fetch_k, so the merged top fetch_k is exact.
+    hits.sort(key=lambda hit: hit[1], reverse=True)
+    # Keep every fetched chunk's embedding so the report can cite it later.
+    remember_chunks(hits[:fetch_k])
+    docs, stats = diversify_by_bill(hits[:fetch_k], k, per_bill, query_embedding, lambda_mult)
+    stats["shards_queried"] = len(shards)
+    return docs, stats
+
+
+@tool
+def retriever(query: str, k: int = 20, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+    """Return (doc, score) tuples from Supabase, one per distinct bill.
+
+    `filters` is a simple metadata-equality dict passed straight to the
+    vector store's similarity search. `k` counts bills, not chunks.
+    """
+    docs, _ = search_bills(query, k, filters)
+    return docs
@@ -0,0 +1,106 @@
+"""Vector-store shards and filter-based shard pruning.
+
+The corpus can be split across several Supabase tables (e.g. one per state,
+federal vs. state, or per session year), each with its own search function
+(which, like the default one, must return each chunk's ``embedding``).
+`select_shards` uses the extracted `FilterResult` to skip shards that cannot
+contain a match, and `search_bills` queries the rest in parallel.
+
+Shards are search indexes only: chunk text for reconstruction is still read
+from the canonical ``chunks_test2`` table.
+
+Configure with the ``VECTOR_SHARDS`` env var, a JSON list such as::
+
+    [{"name": "ca", "table_name": "chunks_ca", "states": ["California"]},
+     {"name": "federal", "table_name": "chunks_federal", "states": ["Federal"]},
+     {"name": "rest", "table_name": "chunks_rest"}]
+
+A shard without ``states``/``years`` matches every filter. When unset, the
+single ``chunks_test2`` table is used. A malformed value raises `ValueError`
+from `get_shards`, which `agent.warmup.start_warmup` calls at startup.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+from agent.state import FilterResult
+
+DEFAULT_QUERY_NAME = "search_bill_chunks_langchain"
+_SHARD_KEYS = {"name", "table_name", "query_name", "states", "years"}
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    name: str
+    table_name: str
+    query_name: str = DEFAULT_QUERY_NAME
+    states: Optional[FrozenSet[str]] = None
+    years: Optional[FrozenSet[int]] = None
+
+    def matches(self, filters: Optional[FilterResult]) -> bool:
+        """Return False only when *filters* rule this shard out entirely."""
+        if not filters:
+            return True
+        if self.states is not None and filters.state and filters.state not in self.states:
+            return False
+        if self.years is not None and filters.year and self.years.isdisjoint(filters.year):
+            return False
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_shards() -> Tuple[Shard, ...]:
+    """Return the configured shards (parsed once from ``VECTOR_SHARDS``)."""
+    raw = os.getenv("VECTOR_SHARDS")
+    if not raw:
+        return (Shard(name="default", table_name="chunks_test2"),)
+    try:
+        specs = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"VECTOR_SHARDS is not valid JSON: {e}") from e
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("VECTOR_SHARDS must be a non-empty JSON list of shard objects")
+    shards = [_parse_shard(i, spec) for i, spec in enumerate(specs)]
+    names = [shard.name for shard in shards]
+    if len(set(names)) != len(names):
+        raise ValueError(f"VECTOR_SHARDS has duplicate shard names: {names}")
+    return tuple(shards)
+
+
+def _parse_shard(i: int, spec: Any) -> Shard:
+    where = f"VECTOR_SHARDS[{i}]"
+    if not isinstance(spec, dict):
+        raise ValueError(f"{where} must be an object, got {spec!r}")
+    unknown = set(spec) - _SHARD_KEYS
+    if unknown:
+        raise ValueError(f"{where} has unknown keys {sorted(unknown)}")
+    for key in ("name", "table_name"):
+        if not isinstance(spec.get(key), str) or not spec[key]:
+            raise ValueError(f"{where} needs a non-empty string {key!r}")
+    states, years = spec.get("states"), spec.get("years")
+    if states is not None and not (isinstance(states, list) and all(isinstance(s, str) for s in states)):
+        raise ValueError(f"{where} 'states' must be a list of state names, got {states!r}")
+    if years is not None:
+        bad_years = ValueError(f"{where} 'years' must be a list of years, got {years!r}")
+        if not isinstance(years, list):
+            raise bad_years
+        try:
+            years = [int(y) for y in years]
+        except (TypeError, ValueError):
+            raise bad_years from None
+    return Shard(
+        name=spec["name"],
+        table_name=spec["table_name"],
+        query_name=spec.get("query_name") or DEFAULT_QUERY_NAME,
+        states=frozenset(states) if states else None,
+        years=frozenset(years) if years else None,
+    )
+
+
+def select_shards(filters: Optional[FilterResult]) -> List[Shard]:
+    """Return the shards that may hold results for *filters*."""
+    return [shard for shard in get_shards() if shard.matches(filters)]
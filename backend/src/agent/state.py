@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TypedDict, Optional, List, Tuple
+from typing import Any, TypedDict, Optional, List, Tuple, Dict
 from pydantic import BaseModel, Field
 
 from langgraph.graph import add_messages
@@ -19,12 +19,20 @@ class ResearchGraphState(TypedDict, total=False):
     enhanced_query: Optional[str]
     filters: Optional[FilterResult]
     retrieved_docs: Optional[List[Tuple[Document, float]]]
+    retrieval_stats: Optional[Dict[str, int]]
+    prefetch_key: Optional[str]
+    prefetch_stats: Optional[Dict[str, int]]
     graded_docs: List[Tuple[Document, float]]
     reconstructed_bills: Optional[List[ReconstructedBill]]
     bill_summaries: Annotated[List[BillSummary], operator.add]
     final_research_started: bool
     final_research: Optional[str]
+    candidates: Optional[List[Tuple[Document, float]]]
+    cursor: Optional[Dict[str, Any]]
+    continuation: bool
+    citations: Optional[List[Dict[str, Any]]]
     bill_card_data: Optional[List[BillCardData]]
+    answer_cache_hit: bool
 
 class FilterResult(BaseModel):
     bill_identifier: Optional[str] = Field(default=None)
@@ -44,35 +44,33 @@ def insert_citation_markers(text, citations_list):
         text (str): The original text string.
         citations_list (list): A list of dictionaries, where each dictionary
                                contains 'start_index', 'end_index', and
-                               'segment_string' (the marker to insert).
+                               'segments' (dicts with a 'label' and an
+                               optional 'short_url' to link to).
                                Indices are assumed to be for the original text.
 
     Returns:
         str: The text with citation markers inserted.
     """
-    # Sort citations by end_index in descending order.
-    # If end_index is the same, secondary sort by start_index descending.
-    # This ensures that insertions at the end of the string don't affect
-    # the indices of earlier parts of the string that still need to be processed.
+    # Sort by insertion point (ties keep start_index order) and rebuild the
+    # string in one left-to-right pass instead of re-slicing it per citation.
     sorted_citations = sorted(
-        citations_list, key=lambda c: (c["end_index"], c["start_index"]), reverse=True
+        citations_list, key=lambda c: (c["end_index"], c["start_index"])
     )
 
-    modified_text = text
+    parts = []
+    prev = 0
     for citation_info in sorted_citations:
-        # These indices refer to positions in the *original* text,
-        # but since we iterate from the end, they remain valid for insertion
-        # relative to the parts of the string already processed.
         end_idx = citation_info["end_index"]
-        marker_to_insert = ""
+        parts.append(text[prev:end_idx])
         for segment in citation_info["segments"]:
-            marker_to_insert += f" [{segment['label']}]({segment['short_url']})"
-        # Insert the citation marker at the original end_idx position
-        modified_text = (
-            modified_text[:end_idx] + marker_to_insert + modified_text[end_idx:]
-        )
-
-    return modified_text
+            if segment.get("short_url"):
+                parts.append(f" [{segment['label']}]({segment['short_url']})")
+            else:
+                parts.append(f" [{segment['label']}]")
+        prev = end_idx
+    parts.append(text[prev:])
+
+    return "".join(parts)
 
 
 def get_citations(response, resolved_urls_map):
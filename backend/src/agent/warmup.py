@@ -0,0 +1,118 @@
+"""Startup warmup and import-time profiling.
+
+`agent` imports its heavy dependencies lazily, which keeps cold starts and
+worker forks fast but moves that cost onto the first request. `warmup`
+pays it ahead of time: it compiles the graph, builds the `get_llm` models,
+every shard's vector store and the Supabase client, and opens a pooled
+connection. `start_warmup` does the same on a daemon thread so the server can start
+accepting requests immediately.
+
+Run ``python -m agent.warmup --profile`` to print an import-time report
+(via ``python -X importtime``) for tracking cold-start latency.
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from agent.configuration import Configuration, get_llm, get_supabase_client, get_vector_store
+from agent.shards import get_shards
+
+
+def _default_models() -> List[str]:
+    defaults = Configuration()
+    # "gpt-4o-mini" is what the nodes request directly.
+    return list(dict.fromkeys(["gpt-4o-mini", defaults.query_generator_model, defaults.answer_model]))
+
+
+def _open_pool() -> None:
+    # A tiny query makes the client establish (and pool) its HTTPS connection.
+    get_supabase_client().table("bills_dup2").select("id").limit(1).execute()
+
+
+def _compile_graph() -> None:
+    import agent.graph  # noqa: F401
+
+
+def warmup(models: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Build every lazily-initialized dependency now; return seconds per step.
+
+    Failures are printed and skipped, so a missing credential or unreachable
+    database never prevents startup; the first request will surface it.
+    """
+    steps: List[Tuple[str, Callable[[], object]]] = [("graph", _compile_graph)]
+    steps += [(f"llm:{model}", lambda model=model: get_llm(model)) for model in (models or _default_models())]
+    steps += [
+        (f"vector_store:{shard.name}", lambda shard=shard: get_vector_store(shard.table_name, shard.query_name))
+        for shard in get_shards()
+    ]
+    steps += [("supabase_pool", _open_pool)]
+
+    timings: Dict[str, float] = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"[warmup] {name} failed: {e}")
+            continue
+        timings[name] = round(time.perf_counter() - started, 3)
+    print(f"[warmup] {timings}")
+    return timings
+
+
+def start_warmup(models: Optional[Iterable[str]] = None) -> threading.Thread:
+    """Run `warmup` on a background daemon thread and return the thread.
+
+    Shard configuration is parsed first, in the caller, so a malformed
+    ``VECTOR_SHARDS`` fails startup instead of the first search.
+    """
+    get_shards()
+    thread = threading.Thread(target=warmup, args=(models,), name="agent-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_profile(module: str = "agent.graph", top: int = 20) -> List[Tuple[str, float, float]]:
+    """Import *module* in a fresh interpreter; return the slowest imports.
+
+    Each entry is ``(module, self_ms, cumulative_ms)``, sorted by cumulative
+    time, as reported by ``python -X importtime``.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", action="store_true", help="print an import-time report instead of warming up")
+    parser.add_argument("--module", default="agent.graph", help="module to profile (with --profile)")
+    parser.add_argument("--top", type=int, default=20, help="number of imports to show (with --profile)")
+    args = parser.parse_args()
+
+    if not args.profile:
+        warmup()
+        return
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for name, self_ms, cumulative_ms in import_profile(args.module, args.top):
+        print(f"{cumulative_ms:>14.1f}{self_ms:>10.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agent import nodes
+from agent.answer_cache import SemanticAnswerCache, stale_bills
+from agent.ingest import content_hash
+
+ROWS = {"b1": {"id": "b1", "content_hash": None}, "b2": {"id": "b2", "content_hash": None}}
+
+
+class FakeClient:
+    def table(self, name):
+        assert name == "bills_dup2"
+        return self
+
+    def select(self, *args):
+        return self
+
+    def in_(self, col, ids):
+        self.ids = ids
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[dict(ROWS[i]) for i in self.ids if i in ROWS])
+
+
+@pytest.fixture(autouse=True)
+def reset_rows():
+    ROWS["b1"]["content_hash"] = content_hash("text one")
+    ROWS["b2"]["content_hash"] = None
+
+
+def test_stale_bills_compares_stored_hashes():
+    versions = {"b1": content_hash("text one"), "b2": content_hash("legacy"), "gone": "x"}
+    assert stale_bills(FakeClient(), versions) == ["gone"]
+    ROWS["b1"]["content_hash"] = content_hash("amended text")
+    assert stale_bills(FakeClient(), versions) == ["b1", "gone"]
+
+
+def test_check_answer_cache_rejects_answers_for_reingested_bills(monkeypatch):
+    cache = SemanticAnswerCache()
+    cache.store([1.0, 0.0], "null", "report", [{"billId": "b1"}], {"b1": content_hash("text one")})
+    monkeypatch.setattr(nodes, "get_answer_cache", lambda: cache)
+    monkeypatch.setattr(nodes, "embed_query", lambda q: (1.0, 0.0))
+    monkeypatch.setattr(nodes, "get_supabase_client", FakeClient)
+    state = {"enhanced_query": "q", "filters": None}
+
+    assert nodes.check_answer_cache(state, {})["answer_cache_hit"] is True
+
+    # Another process (agent.ingest) re-ingested the bill.
+    ROWS["b1"]["content_hash"] = content_hash("amended text")
+    assert nodes.check_answer_cache(state, {})["answer_cache_hit"] is False
+    assert len(cache) == 0
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = SemanticAnswerCache(max_bytes=50_000)
+    for i in range(5):
+        card = {"billId": f"b{i}", "fullText": "x" * 20_000}
+        cache.store([1.0, float(i)], "null", f"report {i}", [card], {f"b{i}": "h"})
+    assert len(cache) == 2 and cache.bytes <= 50_000
+    assert cache.lookup([1.0, 4.0], "null", 0.999).report == "report 4"
+    cache.store([0.0, 1.0], "null", "huge", [{"fullText": "x" * 60_000}], {"b9": "h"})
+    assert len(cache) == 2
+    cache.invalidate_bills(["b3", "b4"])
+    assert cache.bytes == 0
+
+
+def test_hit_replaces_previous_run_results(monkeypatch):
+    cache = SemanticAnswerCache()
+    citations = [{"start_index": 0, "end_index": 6, "segments": [{"bill_id": "b1"}]}]
+    cache.store([1.0, 0.0], "null", "report", [{"billId": "b1"}], {"b1": content_hash("text one")}, citations)
+    monkeypatch.setattr(nodes, "get_answer_cache", lambda: cache)
+    monkeypatch.setattr(nodes, "embed_query", lambda q: (1.0, 0.0))
+    monkeypatch.setattr(nodes, "get_supabase_client", FakeClient)
+    state = {"enhanced_query": "q", "filters": None, "citations": [{"old": True}], "reconstructed_bills": [{"id": "b7"}]}
+
+    update = nodes.check_answer_cache(state, {})
+    assert update["citations"] == citations
+    assert update["reconstructed_bills"] == []
@@ -0,0 +1,53 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from agent.app import PrecompressedStaticFiles, _negotiate, _Variant
+
+VARIANTS = {enc: _Variant(b"", f'"x-{enc}"') for enc in ("identity", "br", "gzip")}
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("", "identity"),
+        ("gzip, br", "br"),
+        ("br;q=0.1, gzip;q=1", "gzip"),
+        ("gzip;q=0.5, identity;q=0.8", "identity"),
+        ("*", "br"),
+        ("br;q=0, *;q=0.5", "gzip"),
+        ("identity;q=0, deflate", "identity"),
+    ],
+)
+def test_negotiates_highest_q(header, expected):
+    assert _negotiate(header, VARIANTS) == expected
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "index.html").write_text("<html>" + "x" * 4096 + "</html>")
+    return TestClient(Starlette(routes=[Mount("/app", PrecompressedStaticFiles(tmp_path))]))
+
+
+def test_if_none_match_uses_weak_comparison(client):
+    first = client.get("/app/", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    etag = first.headers["ETag"]
+    for tag in (etag, f"W/{etag}", f'"other", W/{etag}', "*"):
+        assert client.get("/app/", headers={"Accept-Encoding": "gzip", "If-None-Match": tag}).status_code == 304
+    assert client.get("/app/", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"other"'}).status_code == 200
+
+
+def test_indexes_on_load_and_prefers_prebuilt_variants(tmp_path):
+    body = ("<html>" + "x" * 4096 + "</html>").encode()
+    prebuilt = gzip.compress(body, compresslevel=1)  # differs from what the server would produce
+    (tmp_path / "index.html").write_bytes(body)
+    (tmp_path / "index.html.gz").write_bytes(prebuilt)
+    files = PrecompressedStaticFiles(tmp_path)
+    assert files._assets is None  # nothing is read or compressed at import/mount time
+    files.load()
+    assert set(files.assets) == {"index.html"}
+    assert files.assets["index.html"].variants["gzip"].body == prebuilt
@@ -0,0 +1,35 @@
+import pytest
+
+from agent.citations import split_sentences
+
+
+def sentences(text):
+    return [text[start:end] for start, end in split_sentences(text)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "The measure was introduced as S.B. 1047 in 2024 by Senator Wiener.",
+        "Agencies must report annually under Sec. 2 of the act.",
+        "It amends H.R. 1 to require annual audits of each agency.",
+        "The rule follows the U.S. Code definition of a covered entity.",
+        "It applies to large developers, e.g. those training frontier models.",
+    ],
+)
+def test_abbreviations_do_not_end_sentences(text):
+    assert sentences(text) == [text]
+
+
+def test_splits_on_capitalized_next_sentence():
+    text = 'The bill creates a new office. "It was vetoed" later that same year! Was it ever reintroduced in 2025?'
+    assert sentences(text) == [
+        "The bill creates a new office.",
+        '"It was vetoed" later that same year!',
+        "Was it ever reintroduced in 2025?",
+    ]
+
+
+def test_line_breaks_end_sentences_and_short_fragments_are_skipped():
+    text = "## Key Bills\n- S.B. 1047 sets safety rules for large models\n- Short item.\n"
+    assert sentences(text) == ["- S.B. 1047 sets safety rules for large models"]
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+from agent import nodes
+
+
+class RecordingLLM:
+    def invoke(self, messages):
+        self.prompt = messages[0].content
+        return SimpleNamespace(content="Report.")
+
+
+def summary(bill_id, text):
+    return {"bill_id": bill_id, "title": f"Bill {bill_id}", "summary_text": text}
+
+
+def test_reports_only_the_latest_summary_of_each_current_bill(monkeypatch):
+    llm = RecordingLLM()
+    monkeypatch.setattr(nodes, "get_llm", lambda model: llm)
+    state = {
+        "enhanced_query": "ai hiring bills",
+        "reconstructed_bills": [{"id": "b1"}, {"id": "b0"}],
+        # An earlier search in the same thread summarized b0 (and b9) already.
+        "bill_summaries": [summary("b0", "stale b0"), summary("b9", "old b9"), summary("b1", "new b1"), summary("b0", "new b0")],
+    }
+    nodes.compile_final_research(state, {"configurable": {"citation_threshold": 2}})
+    assert "new b1" in llm.prompt and "new b0" in llm.prompt
+    assert "stale b0" not in llm.prompt and "old b9" not in llm.prompt
+    assert llm.prompt.index("new b1") < llm.prompt.index("new b0")
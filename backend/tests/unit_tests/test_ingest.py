@@ -0,0 +1,178 @@
+import json
+import random
+import string
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from langchain_core.documents import Document
+
+from agent import citations, ingest, shards
+from agent.ingest import (
+    CHUNKS_TABLE,
+    EMBED_MAX_INPUTS,
+    EMBED_MAX_TOKENS,
+    MAX_CHUNK_CHARS,
+    _embedding_batches,
+    chunk_text,
+    ingest_bills,
+)
+
+
+def _text(rng: random.Random, paragraphs: int) -> str:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(200)]
+    return "".join(" ".join(rng.choices(words, k=rng.randint(5, 150))) + ".\n\n" for _ in range(paragraphs))
+
+
+class MemoryStore:
+    def __init__(self) -> None:
+        self.tables: Dict[str, Dict[Tuple[str, int], Dict[str, Any]]] = {}
+        self.bills: Dict[str, Dict[str, Any]] = {}
+
+    def existing_hashes(self, table: str, bill_ids: List[str]) -> Dict[str, Dict[int, str]]:
+        rows = self.tables.get(table, {})
+        return {b: {idx: r["content_hash"] for (bid, idx), r in rows.items() if bid == b} for b in bill_ids}
+
+    def embeddings_by_hash(self, table, bill_ids, hashes):
+        rows = self.tables.get(table, {}).values()
+        return {(r["bill_id"], r["content_hash"]): r["embedding"] for r in rows if r["bill_id"] in bill_ids and r["content_hash"] in hashes}
+
+    def upsert_bills(self, rows):
+        self.bills.update({row["id"]: row for row in rows})
+
+    def upsert_chunks(self, table, rows):
+        for row in rows:
+            self.tables.setdefault(table, {})[(row["bill_id"], row["chunk_idx"])] = dict(row)
+
+    def delete_chunks_from(self, table, bill_id, start_idx):
+        rows = self.tables.get(table, {})
+        for key in [k for k in rows if k[0] == bill_id and k[1] >= start_idx]:
+            del rows[key]
+
+    def full_text(self, table: str, bill_id: str) -> str:
+        rows = sorted((k[1], r["chunk_text"]) for k, r in self.tables[table].items() if k[0] == bill_id)
+        return "".join(text for _, text in rows)
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.texts += texts
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def default_shards(monkeypatch):
+    monkeypatch.delenv("VECTOR_SHARDS", raising=False)
+    shards.get_shards.cache_clear()
+    yield
+    shards.get_shards.cache_clear()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunks_concatenate_back_to_text(seed: int) -> None:
+    rng = random.Random(seed)
+    text = _text(rng, rng.randint(0, 60))
+    # Oversized paragraphs, with and without whitespace, and odd line breaks.
+    text += "x" * rng.randint(0, 3 * MAX_CHUNK_CHARS) + "\n \n\n" + "word " * rng.randint(0, 2000)
+    chunks = chunk_text(text)
+    assert "".join(chunks) == text
+    assert all(chunks) and all(len(c) <= MAX_CHUNK_CHARS for c in chunks)
+    assert chunk_text(text) == chunks
+
+
+def test_chunk_text_empty() -> None:
+    assert chunk_text("") == []
+
+
+def test_embedding_batches_respect_input_limit() -> None:
+    rows = [{"chunk_text": "a"} for _ in range(EMBED_MAX_INPUTS * 2 + 5)]
+    batches = list(_embedding_batches(rows))
+    assert [len(b) for b in batches] == [EMBED_MAX_INPUTS, EMBED_MAX_INPUTS, 5]
+
+
+def test_embedding_batches_respect_token_limit() -> None:
+    rows = [{"chunk_text": "a" * MAX_CHUNK_CHARS} for _ in range(1000)]
+    batches = list(_embedding_batches(rows))
+    assert sum(len(b) for b in batches) == 1000
+    for batch in batches:
+        assert sum(len(r["chunk_text"]) // 3 + 1 for r in batch) <= EMBED_MAX_TOKENS
+
+
+def _bill(text: str, **extra) -> Dict[str, Any]:
+    return {"id": "b1", "bill_identifier": "HB 1", "state": "Texas", "year": 2025, "full_text": text, **extra}
+
+
+def test_early_insert_reuses_shifted_embeddings() -> None:
+    rng = random.Random(0)
+    text = _text(rng, 80)
+    store = MemoryStore()
+    ingest_bills([_bill(text)], store=store, embedder=CountingEmbeddings())
+    before = len(chunk_text(text))
+
+    amended = "Sec. 1a. " + " ".join(["inserted"] * 40) + ".\n\n" + text
+    embedder = CountingEmbeddings()
+    stats = ingest_bills([_bill(amended)], store=store, embedder=embedder)
+
+    assert store.full_text(CHUNKS_TABLE, "b1") == amended
+    assert stats.chunks_embedded <= 2 < before
+    assert stats.chunks_moved + stats.chunks_unchanged + stats.chunks_embedded == stats.chunks
+    assert all(row["embedding"] == [float(len(row["chunk_text"])), 1.0] for row in store.tables[CHUNKS_TABLE].values())
+
+
+def test_chunk_metadata_carries_its_index_for_citations() -> None:
+    rng = random.Random(4)
+    text = _text(rng, 60)
+    store = MemoryStore()
+    ingest_bills([_bill(text)], store=store, embedder=CountingEmbeddings())
+    ingest_bills([_bill("Sec. 1a. Inserted first.\n\n" + text)], store=store, embedder=CountingEmbeddings())
+
+    rows = store.tables[CHUNKS_TABLE]
+    assert len(rows) > 1
+    assert all(row["metadata"]["chunk_idx"] == idx and row["metadata"]["bill_id"] == "b1" for (_, idx), row in rows.items())
+
+    citations._chunks.clear()
+    citations.remember_chunks((Document(page_content=r["chunk_text"], metadata=r["metadata"]), 1.0, r["embedding"]) for r in rows.values())
+    keys, _ = citations._chunks_for(["b1"])
+    assert sorted(keys) == sorted(rows)
+
+
+def test_shrinking_bill_deletes_stale_chunks() -> None:
+    rng = random.Random(1)
+    text = _text(rng, 80)
+    store = MemoryStore()
+    ingest_bills([_bill(text)], store=store, embedder=CountingEmbeddings())
+    short = text[: len(text) // 3]
+    stats = ingest_bills([_bill(short)], store=store, embedder=CountingEmbeddings())
+    assert stats.chunks_deleted > 0
+    assert store.full_text(CHUNKS_TABLE, "b1") == short
+
+
+def test_unchanged_bill_embeds_nothing() -> None:
+    text = _text(random.Random(2), 30)
+    store = MemoryStore()
+    ingest_bills([_bill(text)], store=store, embedder=CountingEmbeddings())
+    embedder = CountingEmbeddings()
+    stats = ingest_bills([_bill(text)], store=store, embedder=embedder)
+    assert embedder.texts == [] and stats.embed_requests == 0
+
+
+def test_chunks_are_written_to_matching_shards(monkeypatch) -> None:
+    monkeypatch.setenv(
+        "VECTOR_SHARDS",
+        json.dumps(
+            [
+                {"name": "tx", "table_name": "chunks_tx", "states": ["Texas"]},
+                {"name": "ca", "table_name": "chunks_ca", "states": ["California"]},
+                {"name": "rest", "table_name": "chunks_rest"},
+            ]
+        ),
+    )
+    shards.get_shards.cache_clear()
+    text = _text(random.Random(3), 30)
+    store = MemoryStore()
+    ingest_bills([_bill(text)], store=store, embedder=CountingEmbeddings())
+    assert set(store.tables) == {CHUNKS_TABLE, "chunks_tx", "chunks_rest"}
+    assert store.full_text("chunks_tx", "b1") == text
+    assert ingest.chunk_tables(_bill(text, state="California")) == [CHUNKS_TABLE, "chunks_ca", "chunks_rest"]
@@ -0,0 +1,27 @@
+import agent
+
+
+def test_graph_export_survives_submodule_import() -> None:
+    import agent.graph  # noqa: F401
+    from langgraph.graph.state import CompiledStateGraph
+
+    from agent import graph
+
+    assert isinstance(graph, CompiledStateGraph)
+    assert isinstance(agent.graph, CompiledStateGraph)
+
+
+def test_warmup_export_survives_submodule_import() -> None:
+    import agent.warmup  # noqa: F401
+    from agent import warmup
+
+    assert callable(warmup)
+    assert warmup.__name__ == "warmup"
+
+
+def test_unknown_attribute_raises() -> None:
+    try:
+        agent.does_not_exist
+    except AttributeError:
+        return
+    raise AssertionError("expected AttributeError")
@@ -0,0 +1,91 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from agent import nodes
+from agent.state import FilterResult
+
+BILLS = [
+    {"id": "ca-1", "bill_identifier": "H.B. 123", "state": "California", "year": 2025, "title": "CA bill"},
+    {"id": "tx-1", "bill_identifier": "HB 123", "state": "Texas", "year": 2025, "title": "TX bill"},
+    {"id": "tx-2", "bill_identifier": "HB 1123", "state": "Texas", "year": 2025, "title": "Other TX bill"},
+] + [
+    {"id": f"nv-{i}", "bill_identifier": f"A.B. {i}", "state": "Nevada", "year": 2025 - i % 3, "title": f"NV bill {i}"}
+    for i in range(60)
+] + [{"id": "nv-dup", "bill_identifier": "AB 7", "state": "Nevada", "year": 2021, "title": "Older NV AB 7"}]
+for bill in BILLS:
+    # What the generated column computes: regexp_replace(lower(bill_identifier), '[^a-z0-9]', '', 'g')
+    bill["bill_identifier_normalized"] = re.sub(r"[^a-z0-9]", "", bill["bill_identifier"].lower())
+CHUNKS = [{"bill_id": bill_id, "chunk_idx": 0, "chunk_text": "Full text."} for bill_id in ("ca-1", "nv-8")]
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, col, value):
+        return FakeQuery([r for r in self.rows if r.get(col) == value])
+
+    def in_(self, col, values):
+        return FakeQuery([r for r in self.rows if r.get(col) in values])
+
+    def order(self, col, desc=False):
+        return FakeQuery(sorted(self.rows, key=lambda r: r.get(col), reverse=desc))
+
+    def limit(self, n):
+        return FakeQuery(self.rows[:n])
+
+    def execute(self):
+        return SimpleNamespace(data=self.rows)
+
+
+class FakeClient:
+    def table(self, name):
+        return FakeQuery(BILLS if name == "bills_dup2" else CHUNKS)
+
+
+@pytest.fixture(autouse=True)
+def fake_supabase(monkeypatch):
+    monkeypatch.setattr(nodes, "get_supabase_client", FakeClient)
+
+
+def _lookup(**filters):
+    return nodes.lookup_bill({"filters": FilterResult(**filters)}, {})["reconstructed_bills"]
+
+
+def test_identifier_spelling_is_normalized():
+    bills = _lookup(bill_identifier="hb123", state="California")
+    assert [b["id"] for b in bills] == ["ca-1"]
+
+
+def test_ambiguous_identifier_falls_back_to_retrieval():
+    assert _lookup(bill_identifier="H.B. 123") == []
+
+
+def test_similar_identifiers_do_not_match():
+    assert _lookup(bill_identifier="HB 12", state="Texas") == []
+
+
+def test_duplicates_are_found_among_many_bills():
+    # Both exact matches are counted however many other bills the state has.
+    assert _lookup(bill_identifier="ab7", state="Nevada") == []
+    assert [b["id"] for b in _lookup(bill_identifier="A.B. 8", state="Nevada")] == ["nv-8"]
+
+
+def test_chunk_query_error_falls_back(monkeypatch):
+    def boom(sb, bill_id):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(nodes, "_fetch_chunk_text", boom)
+    assert _lookup(bill_identifier="HB 123", state="California") == []
+
+
+def test_lookup_seeds_a_paging_cursor():
+    update = nodes.lookup_bill({"filters": FilterResult(bill_identifier="HB 123", state="California")}, {})
+    # "more bills" after a direct lookup pages a fresh search, skipping this bill.
+    assert update["cursor"] == {"offset": 0, "verdicts": {}, "summarized": ["ca-1"]}
+    assert update.get("candidates") is None
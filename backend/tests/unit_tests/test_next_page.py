@@ -0,0 +1,99 @@
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent import nodes
+from agent.answer_cache import SemanticAnswerCache
+from agent.graph import _NEXT_PAGE_RE, route_entry
+
+CURSOR = {"offset": 2, "verdicts": {"b0": True, "b1": False}, "summarized": ["b0"]}
+
+
+def candidates(n):
+    return [(Document(page_content=f"snippet {i}", metadata={"bill_id": f"b{i}"}), 1 - i / 100) for i in range(n)]
+
+
+@pytest.mark.parametrize(
+    "text", ["more", "More!", "next page", "show me more bills", "give me some more results please", "another one", "load more"]
+)
+def test_follow_ups_match(text):
+    assert _NEXT_PAGE_RE.match(text)
+
+
+@pytest.mark.parametrize(
+    "text", ["more AI bills in Texas", "what else does H.B. 123 do?", "tell me more about S.B. 1047", "no more", "moreover"]
+)
+def test_new_questions_do_not_match(text):
+    assert not _NEXT_PAGE_RE.match(text)
+
+
+@pytest.mark.parametrize(
+    "state, expected",
+    [
+        ({"messages": [HumanMessage(content="more")]}, "preprocess_input"),
+        ({"messages": [HumanMessage(content="more")], "cursor": CURSOR, "candidates": candidates(5)}, "next_page"),
+        # After a direct bill lookup: cursor but no pool yet.
+        ({"messages": [HumanMessage(content="more")], "cursor": CURSOR, "candidates": None}, "next_page"),
+        ({"messages": [HumanMessage(content="AI bills in Ohio")], "cursor": CURSOR, "candidates": candidates(5)}, "preprocess_input"),
+        ({"messages": [AIMessage(content="more")], "cursor": CURSOR, "candidates": candidates(5)}, "preprocess_input"),
+    ],
+)
+def test_route_entry(state, expected):
+    assert route_entry(state, {}) == expected
+
+
+def test_route_entry_honours_next_page_config():
+    state = {"messages": [HumanMessage(content="anything")], "cursor": CURSOR, "candidates": candidates(5)}
+    assert route_entry(state, {"configurable": {"next_page": True}}) == "next_page"
+
+
+@pytest.fixture(autouse=True)
+def no_prefetch(monkeypatch):
+    monkeypatch.setattr(nodes, "_start_page_prefetch", lambda page: "prefetch-key")
+
+
+def test_next_page_skips_seen_bills(monkeypatch):
+    monkeypatch.setattr(nodes, "GRADE_PAGE_SIZE", 3)
+    pool = candidates(10)
+    # b3 was already graded and b4 summarized by an earlier page.
+    cursor = {"offset": 3, "verdicts": {"b3": False}, "summarized": ["b4"]}
+    pool[3], pool[4] = pool[4], pool[3]
+    update = nodes.next_page({"candidates": pool, "cursor": cursor}, {})
+    assert [doc.metadata["bill_id"] for doc, _ in update["retrieved_docs"]] == ["b5", "b6", "b7"]
+    assert update["cursor"]["offset"] == 8
+    assert update["continuation"] is True and update["citations"] is None
+
+
+def test_next_page_reports_an_exhausted_pool():
+    update = nodes.next_page({"candidates": candidates(3), "cursor": {**CURSOR, "offset": 3}}, {})
+    assert update["retrieved_docs"] == [] and update["bill_card_data"] == []
+    assert "no more matching bills" in update["messages"][0].content
+
+
+def test_next_page_after_lookup_searches_once(monkeypatch):
+    searched = []
+
+    def search(state):
+        searched.append(state["enhanced_query"])
+        return candidates(4), {"returned_bills": 4}
+
+    monkeypatch.setattr(nodes, "_search_candidates", search)
+    cursor = {"offset": 0, "verdicts": {}, "summarized": ["b1"]}
+    update = nodes.next_page({"enhanced_query": "about HB 1", "candidates": None, "cursor": cursor}, {})
+    assert searched == ["about HB 1"]
+    assert [doc.metadata["bill_id"] for doc, _ in update["retrieved_docs"]] == ["b0", "b2", "b3"]
+    assert update["candidates"] == candidates(4)
+
+
+def test_cache_hit_restores_the_pool(monkeypatch):
+    cache = SemanticAnswerCache()
+    pool = candidates(5)
+    cache.store([1.0, 0.0], "null", "report", [{"billId": "b0"}], {}, candidates=pool, cursor=CURSOR)
+    monkeypatch.setattr(nodes, "get_answer_cache", lambda: cache)
+    monkeypatch.setattr(nodes, "embed_query", lambda q: (1.0, 0.0))
+    monkeypatch.setattr(nodes, "get_supabase_client", lambda: None)  # no bill versions to check
+    config = {"configurable": {"answer_cache_threshold": 0.9}}
+    update = nodes.check_answer_cache({"enhanced_query": "q", "filters": None}, config)
+    assert update["answer_cache_hit"] is True
+    assert update["candidates"] == pool and update["cursor"] == CURSOR
+    assert route_entry({**update, "messages": [HumanMessage(content="more")]}, {}) == "next_page"
@@ -0,0 +1,127 @@
+import re
+
+import pytest
+from langchain_core.documents import Document
+
+from agent import nodes
+from agent.tools_and_schemas import BillSummaryLLM, DocumentGrade, DocumentGrades
+
+# Page of six snippets; docs 1 and 5 are chunks of the same bill.
+PAGE = [
+    (Document(page_content=f"snippet {i}", metadata={"bill_id": bill_id, "title": f"Bill {bill_id}"}), 1 - i / 10)
+    for i, bill_id in enumerate(["b0", "b1", "b2", "b3", "b4", "b1"])
+]
+
+
+def grade(doc_index, is_relevant):
+    return {"doc_index": doc_index, "title": f"doc {doc_index}", "is_relevant": is_relevant, "reasoning": "because"}
+
+
+# Out of order, a repeated doc, a second chunk of an already-relevant bill and
+# an index that isn't on the page.
+GRADES = [
+    grade(3, True),
+    grade(0, False),
+    grade(5, True),
+    grade(1, True),
+    grade(99, True),
+    grade(3, True),
+    grade(2, False),
+    grade(4, True),
+]
+
+
+def grade_stream():
+    """Partial-JSON chunks the way structured-output streaming delivers them.
+
+    Each grade grows key by key; the last one is only complete in the final chunk.
+    """
+    yield {}
+    for i, full in enumerate(GRADES):
+        for n in range(1, len(full) + 1):
+            yield {"grades": GRADES[:i] + [dict(list(full.items())[:n])]}
+
+
+class FakeStructured:
+    def __init__(self, schema):
+        self.schema = schema
+
+    def invoke(self, messages):
+        if self.schema is DocumentGrades:
+            return DocumentGrades(grades=[DocumentGrade(**g) for g in GRADES])
+        assert self.schema is BillSummaryLLM
+        bill_id = re.search(r"text of (b\d+)", messages[0].content).group(1)
+        return BillSummaryLLM(summary_text=f"summary of {bill_id}", one_line_summary=bill_id)
+
+    def stream(self, messages):
+        assert self.schema == DocumentGrades.model_json_schema()
+        yield from grade_stream()
+
+
+class FakeLLM:
+    def with_structured_output(self, schema, **kwargs):
+        return FakeStructured(schema)
+
+
+@pytest.fixture(autouse=True)
+def fakes(monkeypatch):
+    monkeypatch.setattr(nodes, "get_llm", lambda *args, **kwargs: FakeLLM())
+    monkeypatch.setattr(nodes, "get_supabase_client", lambda: None)
+    monkeypatch.setattr(nodes, "_fetch_bill", lambda sb, bill_id: (f"text of {bill_id}", f"https://x/{bill_id}"))
+
+
+def initial_state():
+    return {
+        "enhanced_query": "ai hiring bills",
+        "retrieved_docs": list(PAGE),
+        "cursor": {"offset": 6, "verdicts": {"b9": False}, "summarized": ["b8"]},
+    }
+
+
+def staged():
+    state = initial_state()
+    state.update(nodes.grade_documents(state, {}))
+    state.update(nodes.reconstruct_full_text(state, {}))
+    state["bill_summaries"] = [
+        summary
+        for bill in state["reconstructed_bills"]
+        for summary in nodes.summarize_bills(
+            {
+                "bill_to_summarize": {"bill_id": bill["id"], "title": bill["title"], "full_text": bill["full_text"]},
+                "enhanced_query": state["enhanced_query"],
+            },
+            {},
+        )["bill_summaries"]
+    ]
+    return state
+
+
+def pipelined():
+    state = initial_state()
+    state.update(nodes.grade_and_summarize(state, {}))
+    return state
+
+
+def test_stream_yields_each_grade_once_complete(monkeypatch):
+    class Streaming:
+        def stream(self, messages):
+            yield from grade_stream()
+
+    class LLM:
+        def with_structured_output(self, schema, **kwargs):
+            return Streaming()
+
+    monkeypatch.setattr(nodes, "get_llm", lambda *args, **kwargs: LLM())
+    assert [g.model_dump() for g in nodes._stream_grades("prompt")] == GRADES
+
+
+def test_pipelined_matches_staged():
+    a, b = staged(), pipelined()
+    assert [bill["id"] for bill in a["reconstructed_bills"]] == ["b3", "b1", "b4"]
+    assert a["reconstructed_bills"] == b["reconstructed_bills"]
+    assert a["bill_summaries"] == b["bill_summaries"]
+    assert a["cursor"] == b["cursor"] == {
+        "offset": 6,
+        "verdicts": {"b9": False, "b3": True, "b0": False, "b1": True, "b2": False, "b4": True},
+        "summarized": ["b8", "b3", "b1", "b4"],
+    }
@@ -0,0 +1,50 @@
+import pytest
+
+from agent import nodes, prefetch
+
+
+def _fetch(bill_id):
+    return f"text of {bill_id}", None
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    prefetch._prefetchers.clear()
+    yield
+    prefetch._prefetchers.clear()
+
+
+def test_finish_prefetch_unregisters():
+    key = prefetch.start_prefetch(_fetch, ["b1"])
+    assert prefetch.get_prefetcher(key).get("b1") == ("text of b1", None)
+    assert prefetch.finish_prefetch(key)["hits"] == 1
+    assert prefetch.get_prefetcher(key) is None
+
+
+def test_registry_is_bounded(monkeypatch):
+    monkeypatch.setattr(prefetch, "MAX_REGISTERED", 3)
+    keys = [prefetch.start_prefetch(_fetch, []) for _ in range(5)]
+    assert list(prefetch._prefetchers) == keys[2:]
+
+
+def test_abandoned_prefetchers_expire(monkeypatch):
+    key = prefetch.start_prefetch(_fetch, [])
+    monkeypatch.setattr(prefetch, "REGISTRY_TTL_SECONDS", -1)
+    prefetch.start_prefetch(_fetch, [])
+    assert prefetch.get_prefetcher(key) is None
+
+
+def test_failed_grading_releases_prefetcher(monkeypatch):
+    class FailingLLM:
+        def with_structured_output(self, schema):
+            return self
+
+        def invoke(self, messages):
+            raise RuntimeError("llm down")
+
+    monkeypatch.setattr(nodes, "get_llm", lambda *a, **k: FailingLLM())
+    key = prefetch.start_prefetch(_fetch, ["b1"])
+    doc = nodes.Document(page_content="text", metadata={"bill_id": "b1"})
+    with pytest.raises(RuntimeError):
+        nodes.grade_documents({"enhanced_query": "q", "retrieved_docs": [(doc, 0.9)], "prefetch_key": key}, {})
+    assert prefetch.get_prefetcher(key) is None
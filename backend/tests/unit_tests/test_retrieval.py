@@ -0,0 +1,34 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from agent import citations
+from agent.retrieval import diversify_by_bill
+
+
+def hits(embeddings):
+    """Two chunks each for bills b0..b3, best-first, with the given embeddings."""
+    return [
+        (Document(page_content=f"{b}-{i}", metadata={"bill_id": f"b{b}", "chunk_idx": i}), 1.0 - b / 10 - i / 100, embeddings[b])
+        for b in range(4)
+        for i in range(2)
+    ]
+
+
+def test_missing_embeddings_fall_back_to_score_order():
+    # What LangChain parses when the search function doesn't select `embedding`.
+    empty = [np.array([], dtype=np.float32)] * 4
+    kept, stats = diversify_by_bill(hits(empty), k=2, query_embedding=[1.0, 0.0])
+    assert [doc.metadata["bill_id"] for doc, _ in kept] == ["b0", "b1"]
+    assert stats["returned_bills"] == 2
+
+
+def test_mmr_skips_near_duplicate_bills():
+    embeddings = [np.array(v, dtype=np.float32) for v in ([1, 0], [1, 0.01], [0.6, 0.8], [0, 1])]
+    kept, _ = diversify_by_bill(hits(embeddings), k=2, query_embedding=[1.0, 0.0], lambda_mult=0.3)
+    assert [doc.metadata["bill_id"] for doc, _ in kept] == ["b0", "b3"]
+
+
+def test_remember_chunks_skips_empty_embeddings():
+    citations._chunks.clear()
+    citations.remember_chunks(hits([np.array([], dtype=np.float32)] * 4))
+    assert citations._chunks_for(["b0"]) == ([], None)
@@ -0,0 +1,51 @@
+import pytest
+from langchain_core.documents import Document
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from agent.serde import CompactSerializer
+
+HITS = [
+    (Document(page_content="first " * 300, metadata={"bill_id": "b1", "chunk_idx": 0, "state": "CA"}, id="c1"), 0.91),
+    # Same keys, different order: must come back in its own order.
+    (Document(page_content="second", metadata={"state": "TX", "chunk_idx": 3, "bill_id": "b2"}), 0.5),
+    (Document(page_content="third", metadata={"bill_id": "b3"}, id="c3"), 0.25),
+]
+
+SERDES = {
+    "uncompressed": CompactSerializer(),
+    "compressed": CompactSerializer(compress_level=1, compress_threshold=0),
+}
+
+
+def _roundtrip(serde, obj):
+    return serde.loads_typed(serde.dumps_typed(obj))
+
+
+@pytest.mark.parametrize("serde", SERDES.values(), ids=SERDES.keys())
+def test_hits_roundtrip(serde):
+    restored = _roundtrip(serde, HITS)
+    assert restored == HITS
+    assert [list(doc.metadata) for doc, _ in restored] == [list(doc.metadata) for doc, _ in HITS]
+    assert [doc.id for doc, _ in restored] == ["c1", None, "c3"]
+
+
+@pytest.mark.parametrize("serde", SERDES.values(), ids=SERDES.keys())
+def test_int_scores_keep_their_type(serde):
+    hits = [(doc, i) for i, (doc, _) in enumerate(HITS)]
+    assert [type(score) for _, score in _roundtrip(serde, hits)] == [int, int, int]
+
+
+@pytest.mark.parametrize("serde", SERDES.values(), ids=SERDES.keys())
+@pytest.mark.parametrize("obj", [{"__hits__": 1}, {"keys": [], "content": []}, [], [1, 2.5, "x"], "text", None])
+def test_other_values_roundtrip(serde, obj):
+    assert _roundtrip(serde, obj) == obj
+
+
+def test_compression_is_tagged_and_opt_in():
+    assert SERDES["compressed"].dumps_typed(HITS)[0] == "compact:hits:msgpack+zstd"
+    assert SERDES["uncompressed"].dumps_typed({"a": "b" * 4096})[0] == "msgpack"
+
+
+def test_reads_default_serializer_checkpoints():
+    typed = JsonPlusSerializer().dumps_typed(HITS)
+    assert CompactSerializer().loads_typed(typed) == JsonPlusSerializer().loads_typed(typed)
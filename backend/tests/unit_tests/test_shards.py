@@ -0,0 +1,92 @@
+import importlib
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from agent import retrieval, shards
+from agent.state import FilterResult
+
+# `agent.warmup` is also the name of the lazily exported function.
+warmup = importlib.import_module("agent.warmup")
+
+CONFIG = [
+    {"name": "ca", "table_name": "chunks_ca", "states": ["California"]},
+    {"name": "tx-2025", "table_name": "chunks_tx_2025", "states": ["Texas"], "years": [2025]},
+    {"name": "old", "table_name": "chunks_old", "years": ["2021", 2022]},
+]
+
+
+@pytest.fixture(autouse=True)
+def configured_shards(monkeypatch):
+    monkeypatch.setenv("VECTOR_SHARDS", json.dumps(CONFIG))
+    shards.get_shards.cache_clear()
+    yield
+    shards.get_shards.cache_clear()
+
+
+def names(filters):
+    return [shard.name for shard in shards.select_shards(filters)]
+
+
+def test_prunes_by_state_and_year():
+    assert names(None) == ["ca", "tx-2025", "old"]
+    assert names(FilterResult(state="California")) == ["ca", "old"]
+    assert names(FilterResult(state="Texas", year=[2025])) == ["tx-2025"]
+    assert names(FilterResult(year=[2021])) == ["ca", "old"]
+    assert names(FilterResult(state="Texas", year=[2021, 2025])) == ["tx-2025", "old"]
+
+
+def test_no_matching_shard_searches_nothing(monkeypatch):
+    def unexpected(*args):
+        raise AssertionError("no shard should be queried")
+
+    monkeypatch.setattr(retrieval, "embed_query", lambda query: (1.0, 0.0))
+    monkeypatch.setattr(retrieval, "get_vector_store", unexpected)
+    assert names(FilterResult(state="Texas", year=[2023])) == []
+    docs, stats = retrieval.search_bills("q", k=5, filter_result=FilterResult(state="Texas", year=[2023]))
+    assert docs == [] and stats["shards_queried"] == 0 and stats["returned_bills"] == 0
+
+
+class FakeShardStore:
+    def __init__(self, table_name):
+        self.table_name = table_name
+
+    def similarity_search_by_vector_returning_embeddings(self, embedding, k, filter=None):
+        # Each shard holds bills with interleaved scores; return its own top k.
+        offset = {"chunks_ca": 0, "chunks_tx_2025": 1, "chunks_old": 2}[self.table_name]
+        hits = [
+            (Document(page_content=f"{self.table_name}-{i}", metadata={"bill_id": f"{self.table_name}-{i}", "chunk_idx": 0}), 1 - (3 * i + offset) / 100, [])
+            for i in range(10)
+        ]
+        return hits[:k]
+
+
+def test_merges_a_global_top_fetch_k_across_shards(monkeypatch):
+    monkeypatch.setattr(retrieval, "embed_query", lambda query: (1.0, 0.0))
+    monkeypatch.setattr(retrieval, "get_vector_store", lambda table_name, query_name: FakeShardStore(table_name))
+    docs, stats = retrieval.search_bills("q", k=4, fetch_k=5)
+    assert stats["shards_queried"] == 3 and stats["fetched_chunks"] == 5
+    assert [doc.page_content for doc, _ in docs] == ["chunks_ca-0", "chunks_tx_2025-0", "chunks_old-0", "chunks_ca-1"]
+    assert [score for _, score in docs] == sorted((score for _, score in docs), reverse=True)
+
+
+@pytest.mark.parametrize(
+    "raw, message",
+    [
+        ("{not json", "not valid JSON"),
+        ("[]", "non-empty JSON list"),
+        ('{"name": "ca"}', "non-empty JSON list"),
+        ('[{"name": "ca"}]', "'table_name'"),
+        ('[{"name": "ca", "table_name": "t", "state": ["California"]}]', "unknown keys ['state']"),
+        ('[{"name": "ca", "table_name": "t", "states": "California"}]', "'states' must be a list"),
+        ('[{"name": "ca", "table_name": "t", "years": ["soon"]}]', "'years' must be a list"),
+        ('[{"name": "a", "table_name": "t"}, {"name": "a", "table_name": "u"}]', "duplicate shard names"),
+    ],
+)
+def test_malformed_config_fails_at_startup(monkeypatch, raw, message):
+    monkeypatch.setenv("VECTOR_SHARDS", raw)
+    shards.get_shards.cache_clear()
+    monkeypatch.setattr(warmup, "warmup", lambda models=None: pytest.fail("warmup thread started"))
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        warmup.start_warmup()
@@ -52,6 +52,14 @@ export default function App() {
                 title: "Filtering",
                 data: dataMessage,
             }
+        } else if (event.check_answer_cache?.answer_cache_hit){
+            setFinalResearchStarted(true);
+            setBillCardData(event.check_answer_cache.bill_card_data || []);
+            hasFinalizeEventOccurredRef.current = true;
+            processedEvent = {
+                title: "Finalizing",
+                data: "Reusing a recent answer to the same question.",
+            }
         } else if (event.retrieve_documents){
             const docs = event.retrieve_documents.retrieved_docs || [];
             const numDocs = docs.length;
@@ -59,6 +67,19 @@ export default function App() {
                 title: "Retrieving",
                 data: `${numDocs} documents retrieved`,
             }
+        } else if (event.next_page){
+            const docs = event.next_page.retrieved_docs || [];
+            if (docs.length === 0) {
+                setFinalResearchStarted(true);
+                setBillCardData([]);
+                hasFinalizeEventOccurredRef.current = true;
+            }
+            processedEvent = {
+                title: "Retrieving",
+                data: docs.length > 0
+                    ? `Continuing with the next ${docs.length} candidate bills`
+                    : "No more matching bills for this search",
+            }
         } else if (event.grade_documents){
             const docs = event.grade_documents.graded_docs || [];
             const numDocs = docs.length;
@@ -66,6 +87,12 @@ export default function App() {
                 title: "Grading",
                 data: `Found ${numDocs} relevant documents to your query`,
             }
+        } else if (event.grade_and_summarize){
+            const bills = event.grade_and_summarize.reconstructed_bills || [];
+            processedEvent = {
+                title: "Summarizing",
+                data: `Graded and summarized ${bills.length} relevant bills`,
+            }
         } else if (event.reconstruct_full_text){
             processedEvent = {
                 title: "Reconstructing",
@@ -1,11 +1,42 @@
 import path from "node:path";
-import { defineConfig } from "vite";
+import { readdirSync, readFileSync, statSync, writeFileSync } from "node:fs";
+import { brotliCompressSync, constants as zlibConstants, gzipSync } from "node:zlib";
+import { defineConfig, type Plugin } from "vite";
 import react from "@vitejs/plugin-react-swc";
 import tailwindcss from "@tailwindcss/vite";
 
+// Mirrors MIN_COMPRESS_SIZE / COMPRESSIBLE_TYPES in backend/src/agent/app.py,
+// which serves these .br/.gz files instead of compressing them at startup.
+const MIN_COMPRESS_SIZE = 1024;
+const COMPRESSIBLE = /\.(html|js|mjs|css|json|svg|txt|wasm)$/;
+
+// Write max-level brotli and gzip variants next to every compressible output file.
+function precompress(): Plugin {
+  return {
+    name: "precompress",
+    apply: "build",
+    writeBundle(options) {
+      const outDir = options.dir ?? "dist";
+      for (const name of readdirSync(outDir, { recursive: true, encoding: "utf8" })) {
+        const file = path.join(outDir, name);
+        if (!COMPRESSIBLE.test(file) || !statSync(file).isFile()) continue;
+        const body = readFileSync(file);
+        if (body.length < MIN_COMPRESS_SIZE) continue;
+        const variants: [string, Buffer][] = [
+          [".br", brotliCompressSync(body, { params: { [zlibConstants.BROTLI_PARAM_QUALITY]: 11 } })],
+          [".gz", gzipSync(body, { level: 9 })],
+        ];
+        for (const [suffix, compressed] of variants) {
+          if (compressed.length < body.length) writeFileSync(file + suffix, compressed);
+        }
+      }
+    },
+  };
+}
+
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react(), tailwindcss()],
+  plugins: [react(), tailwindcss(), precompress()],
   base: "/app/",
   resolve: {
     alias: {